@@ -1,9 +1,11 @@
 """Chat and conversation routes."""
+import json
 import logging
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field, validator
 
@@ -100,6 +102,48 @@ async def chat_with_video(
             detail="An error occurred while processing your request"
         )
 
+@router.post("/{video_id}/stream")
+async def stream_chat_with_video(
+    video_id: int,
+    request: ChatRequest,
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """Chat with video, streaming the answer as server-sent events."""
+    logger.info(f"Streaming chat request for video {video_id}: {request.message[:50]}...")
+    
+    # Validate video exists
+    video = db.query(Video).filter(Video.id == video_id).first()
+    if not video:
+        logger.warning(f"Video {video_id} not found")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail=f"Video with ID {video_id} not found"
+        )
+    
+    # Check if video is processed
+    if not _is_video_processed(video_id):
+        logger.warning(f"Video {video_id} not processed yet")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Video must be processed before chatting. Please process the video first."
+        )
+    
+    langchain_service = LangChainVideoService(db)
+    
+    def event_stream():
+        # The answer is generated lazily, so errors surface here after the response
+        # has started; report them as an error event instead of cutting the stream
+        try:
+            for token in langchain_service.ask_question_stream(video_id, request.message):
+                yield f"data: {json.dumps({'token': token})}\n\n"
+        except Exception as e:
+            logger.error(f"Error in stream_chat_with_video for video {video_id}: {str(e)}")
+            yield f"event: error\ndata: {json.dumps({'error': 'An error occurred while processing your request'})}\n\n"
+            return
+        yield f"data: {json.dumps({'done': True, 'conversation_id': request.conversation_id})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @router.post("/langchain/process/{video_id}", response_model=LangChainProcessResponse)
 async def process_with_langchain(
     video_id: int, 
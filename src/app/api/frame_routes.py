@@ -81,7 +81,7 @@ async def generate_embeddings(
         
         # Generate embeddings
         embedding_service = SimpleEmbeddingService(db)
-        result = embedding_service.generate_frame_embeddings(video_id)
+        result = await embedding_service.agenerate_frame_embeddings(video_id)
         
         if result.get("success"):
             return {
@@ -141,7 +141,7 @@ async def visual_search(
         
         if search_type == "visual" or search_type == "hybrid":
             # Use visual search with CLIP
-            raw_results = embedding_service.search_visual_content(video_id, query, limit)
+            raw_results = await embedding_service.asearch_visual_content(video_id, query, limit)
             
             # Format results for frontend (convert similarity to score and add match_type)
             formatted_results = []
@@ -28,6 +28,7 @@ from .utils import (
     quick_backup,
     get_db_stats,
     maintenance_routine,
+    maintenance_routine_async,
 )
 
 __all__ = [
@@ -57,4 +58,5 @@ __all__ = [
     "quick_backup",
     "get_db_stats",
     "maintenance_routine",
+    "maintenance_routine_async",
 ] 
\ No newline at end of file
@@ -41,6 +41,8 @@ class DatabaseConfig:
         self.pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "30"))
         self.pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
         self.connect_timeout = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+        self.sqlite_mmap_size = int(os.getenv("DB_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 256 MB
+        self.sqlite_cache_size = int(os.getenv("DB_SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB, i.e. 64 MB
         
     @property
     def is_sqlite(self) -> bool:
@@ -124,6 +126,12 @@ def create_database_engine() -> Engine:
                 cursor.execute("PRAGMA journal_mode=WAL")
                 # Set synchronous mode to NORMAL for better performance
                 cursor.execute("PRAGMA synchronous=NORMAL")
+                # Keep temporary tables and indices in memory
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                # Serve reads from a memory-mapped region instead of read() syscalls
+                cursor.execute(f"PRAGMA mmap_size={int(config.sqlite_mmap_size)}")
+                # Enlarge the per-connection page cache
+                cursor.execute(f"PRAGMA cache_size={int(config.sqlite_cache_size)}")
                 cursor.close()
         
         @event.listens_for(engine, "engine_connect")
@@ -11,12 +11,14 @@ This module provides utility functions for:
 
 import os
 import json
+import asyncio
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
-from sqlalchemy import text, inspect
+from sqlalchemy import text, inspect, exists
 from sqlalchemy.orm import Session
 
 from .database import get_db_session, engine, config, logger
@@ -280,10 +282,14 @@ class DatabaseStats:
         try:
             with get_db_session() as db:
                 # Find sections without videos
-                orphaned_sections = db.query(Section.id).outerjoin(Video).filter(Video.id.is_(None)).all()
+                orphaned_sections = db.query(Section.id).filter(
+                    ~exists().where(Video.id == Section.video_id)
+                ).all()
                 
                 # Find frames without videos
-                orphaned_frames = db.query(Frame.id).outerjoin(Video).filter(Video.id.is_(None)).all()
+                orphaned_frames = db.query(Frame.id).filter(
+                    ~exists().where(Video.id == Frame.video_id)
+                ).all()
                 
                 return {
                     "sections": [s[0] for s in orphaned_sections],
@@ -305,12 +311,16 @@ class DatabaseStats:
         try:
             with get_db_session() as db:
                 # Delete orphaned sections
-                orphaned_sections = db.query(Section).outerjoin(Video).filter(Video.id.is_(None))
+                orphaned_sections = db.query(Section).filter(
+                    ~exists().where(Video.id == Section.video_id)
+                )
                 sections_count = orphaned_sections.count()
                 orphaned_sections.delete(synchronize_session=False)
                 
                 # Delete orphaned frames
-                orphaned_frames = db.query(Frame).outerjoin(Video).filter(Video.id.is_(None))
+                orphaned_frames = db.query(Frame).filter(
+                    ~exists().where(Video.id == Frame.video_id)
+                )
                 frames_count = orphaned_frames.count()
                 orphaned_frames.delete(synchronize_session=False)
                 
@@ -327,6 +337,14 @@ class DatabaseStats:
 class DatabaseMigration:
     """Database migration utilities."""
     
+    REQUIRED_TABLES = ("videos", "sections", "frames")
+    
+    @staticmethod
+    def _version_for(missing_tables: List[str]) -> str:
+        """Derive the schema version from the set of missing tables."""
+        # Simple version based on table existence
+        return "0.0.0" if missing_tables else "1.0.0"
+    
     @staticmethod
     def get_schema_version() -> str:
         """
@@ -336,14 +354,9 @@ class DatabaseMigration:
             str: Schema version
         """
         try:
-            inspector = inspect(engine)
-            tables = inspector.get_table_names()
-            
-            # Simple version based on table existence
-            if all(table in tables for table in ["videos", "sections", "frames"]):
-                return "1.0.0"
-            else:
-                return "0.0.0"
+            tables = set(inspect(engine).get_table_names())
+            missing_tables = [t for t in DatabaseMigration.REQUIRED_TABLES if t not in tables]
+            return DatabaseMigration._version_for(missing_tables)
                 
         except Exception as e:
             logger.error(f"Failed to get schema version: {e}")
@@ -358,17 +371,16 @@ class DatabaseMigration:
             dict: Validation results
         """
         try:
-            inspector = inspect(engine)
-            tables = inspector.get_table_names()
-            
-            required_tables = ["videos", "sections", "frames"]
-            missing_tables = [table for table in required_tables if table not in tables]
+            # Inspect once; the schema version is derived from the same table list
+            tables = inspect(engine).get_table_names()
+            tables_set = set(tables)
+            missing_tables = [t for t in DatabaseMigration.REQUIRED_TABLES if t not in tables_set]
             
             validation_result = {
                 "valid": len(missing_tables) == 0,
                 "tables_found": tables,
                 "missing_tables": missing_tables,
-                "schema_version": DatabaseMigration.get_schema_version(),
+                "schema_version": DatabaseMigration._version_for(missing_tables),
             }
             
             if validation_result["valid"]:
@@ -397,12 +409,55 @@ def get_db_stats() -> Dict[str, Any]:
         "orphaned_records": DatabaseStats.get_orphaned_records(),
     }
 
+async def maintenance_routine_async() -> Dict[str, Any]:
+    """
+    Run routine database maintenance tasks concurrently.
+    
+    Orphan cleanup and backup cleanup are independent (only the former touches
+    the database), so they run in parallel worker threads. ANALYZE and VACUUM
+    follow sequentially, with VACUUM last since it needs exclusive access.
+    
+    Returns:
+        dict: Results keyed by task name
+    """
+    results = {}
+    
+    # Cleanup orphaned records and old backups in parallel
+    results["orphaned_cleanup"], results["backup_cleanup"] = await asyncio.gather(
+        asyncio.to_thread(DatabaseStats.cleanup_orphaned_records),
+        asyncio.to_thread(DatabaseBackup.cleanup_old_backups),
+    )
+    
+    # Analyze database
+    results["analyze"] = await asyncio.to_thread(DatabaseMaintenance.analyze_database)
+    
+    # Vacuum if SQLite
+    if config.is_sqlite:
+        results["vacuum"] = await asyncio.to_thread(DatabaseMaintenance.vacuum_database)
+    
+    logger.info("Database maintenance routine completed")
+    return results
+
 def maintenance_routine() -> Dict[str, Any]:
-    """Run routine database maintenance tasks."""
+    """
+    Run routine database maintenance tasks.
+    
+    Same tasks as maintenance_routine_async(), with the two cleanups in worker
+    threads. It does not start an event loop, so it also works when called from
+    code that is running one (though it blocks that loop until done; await the
+    async variant there instead).
+    
+    Returns:
+        dict: Results keyed by task name
+    """
     results = {}
     
-    # Cleanup orphaned records
-    results["orphaned_cleanup"] = DatabaseStats.cleanup_orphaned_records()
+    # Cleanup orphaned records and old backups in parallel
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        orphaned_cleanup = executor.submit(DatabaseStats.cleanup_orphaned_records)
+        backup_cleanup = executor.submit(DatabaseBackup.cleanup_old_backups)
+        results["orphaned_cleanup"] = orphaned_cleanup.result()
+        results["backup_cleanup"] = backup_cleanup.result()
     
     # Analyze database
     results["analyze"] = DatabaseMaintenance.analyze_database()
@@ -411,8 +466,5 @@ def maintenance_routine() -> Dict[str, Any]:
     if config.is_sqlite:
         results["vacuum"] = DatabaseMaintenance.vacuum_database()
     
-    # Cleanup old backups
-    results["backup_cleanup"] = DatabaseBackup.cleanup_old_backups()
-    
     logger.info("Database maintenance routine completed")
-    return results 
\ No newline at end of file
+    return results
@@ -1,5 +1,6 @@
 # FastAPI app entrypoint 
 import os
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
@@ -17,6 +18,22 @@ from .db import init_db, check_db_health, close_db_connections, get_db_info
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _warmup_langchain() -> None:
+    """Load models and clients, and pre-build QA chains for QA_WARMUP_VIDEO_IDS and the videos used before the last restart."""
+    try:
+        from .services.langchain.qa_manager import QAManager
+        from .services.langchain_service import get_langchain_engine
+        
+        video_ids = [
+            int(video_id) for video_id in os.getenv("QA_WARMUP_VIDEO_IDS", "").split(",")
+            if video_id.strip().isdigit()
+        ]
+        video_ids += [v for v in QAManager.load_hot_videos() if v not in video_ids]
+        
+        get_langchain_engine().warmup(video_ids)
+    except Exception as e:
+        logger.warning(f"LangChain warmup failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -33,6 +50,10 @@ async def lifespan(app: FastAPI):
             logger.error("Database health check failed during startup")
             raise Exception("Database initialization failed")
         
+        # Warm up models, clients and QA chains for hot videos in the background
+        if os.getenv("DISABLE_WARMUP", "false").lower() != "true":
+            app.state.qa_warmup = asyncio.create_task(asyncio.to_thread(_warmup_langchain))
+        
         logger.info("Application startup completed successfully")
         
     except Exception as e:
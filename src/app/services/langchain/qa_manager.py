@@ -6,21 +6,127 @@ including transcript-based question answering with source citations and
 configurable retrieval parameters.
 """
 
+import os
+import json
+import time
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
-from functools import lru_cache
+import threading
+from typing import Dict, Any, Optional, List, Tuple, Iterator, AsyncIterator
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from pathlib import Path
+from dataclasses import dataclass, fields, replace
+from functools import cached_property
 
+import numpy as np
 from langchain_openai import ChatOpenAI
+from langchain.cache import SQLiteCache
 from langchain.chains import RetrievalQA
-from langchain.prompts import PromptTemplate
+from langchain.globals import set_llm_cache
+from langchain.prompts import ChatPromptTemplate
 from langchain.schema import Document
 
-from .vector_store_manager import VectorStoreManager
+from .vector_store_manager import format_timestamp, get_shared_vector_store_manager
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Persist LLM generations so identical prompts skip the OpenAI round-trip
+if os.getenv("QA_LLM_CACHE", "true").lower() == "true":
+    set_llm_cache(SQLiteCache(database_path=os.getenv("QA_LLM_CACHE_PATH", ".langchain_cache.db")))
+
+
+class _TokenBucket:
+    """Thread-safe token bucket refilled continuously at a per-minute rate; a rate of 0 or less never throttles."""
+    
+    def __init__(self, per_minute: int):
+        self.unlimited = per_minute <= 0
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _take(self, amount: float) -> float:
+        """Take amount tokens if available; otherwise return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return 0.0
+            return (amount - self.tokens) / self.rate
+    
+    def acquire(self, amount: float) -> None:
+        """Block until amount tokens are available, then take them."""
+        if self.unlimited:
+            return
+        amount = min(amount, self.capacity)
+        while wait := self._take(amount):
+            time.sleep(wait)
+    
+    async def aacquire(self, amount: float) -> None:
+        """Wait without blocking the event loop until amount tokens are available, then take them."""
+        if self.unlimited:
+            return
+        amount = min(amount, self.capacity)
+        while wait := self._take(amount):
+            await asyncio.sleep(wait)
+
+
+class _RateLimitedChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI that waits for request and token budget before every API call.
+    
+    Throttling ahead of the API keeps bursts (batches, concurrent section
+    generation) under the account quota instead of paying for 429 retries.
+    Budget is taken in _generate/_stream, which LangChain only reaches on an
+    LLM cache miss, so cached answers are never throttled. Async calls wait
+    with asyncio.sleep instead of holding an executor thread.
+    """
+    
+    def _token_budget(self, messages: List[Any]) -> int:
+        # Roughly four characters per token, plus the completion budget
+        prompt_chars = sum(len(message.content) for message in messages if isinstance(message.content, str))
+        return prompt_chars // 4 + (self.max_tokens or 0)
+    
+    def _streams(self, kwargs: Dict[str, Any]) -> bool:
+        # A streaming _generate delegates to _stream, which takes the budget itself
+        stream = kwargs.get("stream")
+        return self.streaming if stream is None else stream
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._streams(kwargs):
+            _REQUEST_BUCKET.acquire(1)
+            _TOKEN_BUCKET.acquire(self._token_budget(messages))
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        if not self._streams(kwargs):
+            await _REQUEST_BUCKET.aacquire(1)
+            await _TOKEN_BUCKET.aacquire(self._token_budget(messages))
+        return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+    
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[Any]:
+        _REQUEST_BUCKET.acquire(1)
+        _TOKEN_BUCKET.acquire(self._token_budget(messages))
+        yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+    
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[Any]:
+        await _REQUEST_BUCKET.aacquire(1)
+        await _TOKEN_BUCKET.aacquire(self._token_budget(messages))
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            yield chunk
+
+
+# Shared by every QAManager: the quota belongs to the API key, not the instance
+_RATE_LIMIT = os.getenv("QA_RATE_LIMIT", "true").lower() == "true"
+_REQUEST_BUCKET = _TokenBucket(int(os.getenv("QA_REQUESTS_PER_MINUTE", "3500")))
+_TOKEN_BUCKET = _TokenBucket(int(os.getenv("QA_TOKENS_PER_MINUTE", "90000")))
+
 
 @dataclass
 class QAConfig:
@@ -29,8 +135,21 @@ class QAConfig:
     temperature: float = 0.1
     max_tokens: Optional[int] = None
     retrieval_k: int = 3
+    search_type: str = "mmr"
+    fetch_k: int = 10
+    lambda_mult: float = 0.5
     max_source_docs: int = 3
     chunk_size: int = 200
+    prompt_cache_key: Optional[str] = "video_qa_v1"
+    system_prompt: Optional[str] = None  # Overrides QAManager.SYSTEM_PREFIX
+    max_concurrency: int = 10
+    adaptive_retrieval: bool = True
+    short_question_chars: int = 30
+    long_question_chars: int = 150
+    response_cache: bool = True
+    semantic_cache_threshold: float = 0.95
+    response_cache_size: int = 256
+    response_cache_ttl: float = 3600.0  # Seconds a cached answer stays valid
 
 
 @dataclass
@@ -43,6 +162,68 @@ class QAResponse:
     error_message: Optional[str] = None
 
 
+class _VideoResponseCache:
+    """Answered questions for one video, looked up by exact text or embedding similarity."""
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.questions: List[str] = []
+        self.embeddings: List[Optional[np.ndarray]] = []
+        self.responses: List[QAResponse] = []
+        self.created: List[float] = []
+        # Exact-match index: normalized question -> (created, response)
+        self.exact: Dict[str, Tuple[float, QAResponse]] = {}
+        # Stacked question embeddings with their entry indices and creation times,
+        # rebuilt lazily after the entries change
+        self._matrix: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    
+    def get_exact(self, question: str) -> Optional[QAResponse]:
+        """Return the cached response for an identical normalized question, if still fresh."""
+        entry = self.exact.get(question)
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+    
+    def get_similar(self, embedding: np.ndarray, threshold: float) -> Optional[QAResponse]:
+        """Return the fresh cached response whose question embedding is most similar, if above threshold."""
+        if self._matrix is None:
+            indices = [i for i, cached in enumerate(self.embeddings) if cached is not None]
+            self._matrix = (
+                np.vstack([self.embeddings[i] for i in indices]) if indices else np.empty((0, 0), np.float32),
+                np.asarray(indices, dtype=np.intp),
+                np.asarray([self.created[i] for i in indices], dtype=np.float64)
+            )
+        matrix, indices, created = self._matrix
+        if not len(indices):
+            return None
+        
+        scores = matrix @ embedding
+        scores[created <= time.monotonic() - self.ttl] = -np.inf
+        best = int(np.argmax(scores))
+        return self.responses[indices[best]] if scores[best] >= threshold else None
+    
+    def add(self, question: str, embedding: Optional[np.ndarray], response: QAResponse) -> None:
+        """Store a response, evicting the oldest entry when full."""
+        created = time.monotonic()
+        self.questions.append(question)
+        self.embeddings.append(embedding)
+        self.responses.append(response)
+        self.created.append(created)
+        self.exact[question] = (created, response)
+        self._matrix = None
+        if len(self.questions) > self.max_size:
+            evicted, evicted_created = self.questions[0], self.created[0]
+            if self.exact.get(evicted, (None,))[0] == evicted_created:
+                del self.exact[evicted]
+            del self.questions[0], self.embeddings[0], self.responses[0], self.created[0]
+
+
+# Process-wide answer cache keyed by video ID and answer fields; QAManager instances are created per request
+_RESPONSE_CACHE: Dict[Tuple[int, tuple], _VideoResponseCache] = {}
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
 class QAManager:
     """
     Manages Q&A operations for video content.
@@ -52,20 +233,44 @@ class QAManager:
     It handles vector store management, prompt engineering, and response formatting.
     """
     
-    # Default prompt template for video Q&A
-    DEFAULT_PROMPT_TEMPLATE = """You are a helpful AI assistant that analyzes video content based on transcripts. 
+    # Static instructions sent first so every request shares the same cacheable prefix
+    SYSTEM_PREFIX = """You are a helpful AI assistant that analyzes video content based on transcripts. 
 You have access to a video transcript and should answer questions about the video content.
 
-Use the following pieces of context from the video transcript to answer the question. 
-If you don't know the answer based on the transcript, just say you don't have enough information in the transcript to answer that question.
-
-Context from video transcript:
+Use the pieces of context from the video transcript provided by the user to answer the question. 
+If you don't know the answer based on the transcript, just say you don't have enough information in the transcript to answer that question."""
+    
+    # Per-request context and question go last, after the shared prefix
+    USER_SUFFIX = """Context from video transcript:
 {context}
 
 Question: {question}
 
 Answer based on the video content:"""
     
+    # Config fields baked into the LLM, and into a built chain (its cache key)
+    LLM_FIELDS = ("model_name", "temperature", "max_tokens", "prompt_cache_key")
+    RETRIEVER_FIELDS = ("search_type", "fetch_k", "lambda_mult")
+    PROMPT_FIELDS = ("system_prompt",)
+    CHAIN_FIELDS = LLM_FIELDS + RETRIEVER_FIELDS + PROMPT_FIELDS + ("retrieval_k",)
+    # Config fields that shape a cached answer (its response cache key)
+    ANSWER_FIELDS = CHAIN_FIELDS + (
+        "max_source_docs", "chunk_size", "adaptive_retrieval", "short_question_chars", "long_question_chars"
+    )
+    
+    # Process-wide TTL LRU of built QA chains, keyed by video ID and chain fields
+    CHAIN_CACHE_SIZE = 128
+    CHAIN_CACHE_TTL = 600
+    _chain_cache: "OrderedDict[tuple, Tuple[float, RetrievalQA]]" = OrderedDict()
+    _chain_cache_lock = threading.RLock()
+    _chain_cache_stats = {"hits": 0, "misses": 0}
+    
+    # Most recently built videos, persisted so a restarted process can warm them up
+    HOT_VIDEOS_FILE = Path(os.getenv("QA_HOT_VIDEOS_FILE", "storage/qa_cache/hot_videos.json"))
+    HOT_VIDEOS_LIMIT = 32
+    _hot_videos_lock = threading.Lock()
+    _hot_videos: Optional[List[int]] = None
+    
     def __init__(self, config: Optional[QAConfig] = None):
         """
         Initialize the Q&A manager.
@@ -74,44 +279,126 @@ Answer based on the video content:"""
             config: Optional configuration object. If None, uses default settings.
         """
         self.config = config or QAConfig()
-        self.vector_store_manager = VectorStoreManager()
+        self.vector_store_manager = get_shared_vector_store_manager()
         
-        # Initialize LLM with configuration
-        self._initialize_llm()
+        # The prompt is constant, so parse and validate it once
+        self.prompt_template = self._build_prompt_template()
         
         logger.info(f"QAManager initialized with model: {self.config.model_name}")
     
-    def _initialize_llm(self) -> None:
-        """Initialize the language model with current configuration."""
+    def _build_prompt_template(self) -> ChatPromptTemplate:
+        """Build the chat prompt: static system instructions first, per-request content last."""
+        return ChatPromptTemplate.from_messages([
+            ("system", self.config.system_prompt or self.SYSTEM_PREFIX),
+            ("human", self.USER_SUFFIX)
+        ])
+    
+    @cached_property
+    def llm(self) -> ChatOpenAI:
+        """Language model for the current configuration, created on first use."""
         try:
-            self.llm = ChatOpenAI(
+            # Route requests sharing the static prompt prefix to the same prompt cache
+            model_kwargs = {}
+            if self.config.prompt_cache_key:
+                model_kwargs["extra_body"] = {"prompt_cache_key": self.config.prompt_cache_key}
+            
+            llm_class = _RateLimitedChatOpenAI if _RATE_LIMIT else ChatOpenAI
+            llm = llm_class(
                 model_name=self.config.model_name,
                 temperature=self.config.temperature,
-                max_tokens=self.config.max_tokens
+                max_tokens=self.config.max_tokens,
+                model_kwargs=model_kwargs
             )
             logger.debug("LLM initialized successfully")
+            return llm
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {e}")
             raise RuntimeError(f"Failed to initialize language model: {e}")
     
-    def _create_prompt_template(self) -> PromptTemplate:
-        """Create the prompt template for video Q&A."""
-        return PromptTemplate(
-            template=self.DEFAULT_PROMPT_TEMPLATE,
-            input_variables=["context", "question"]
-        )
-    
-    @lru_cache(maxsize=32)
-    def get_qa_chain(self, video_id: int) -> Optional[RetrievalQA]:
+    def get_qa_chain(
+        self,
+        video_id: int,
+        include_sources: bool = True,
+        retrieval_k: Optional[int] = None
+    ) -> Optional[RetrievalQA]:
         """
         Get QA chain for a video with caching for performance.
         
+        Chains are shared by all QAManager instances with the same configuration
+        and expire after CHAIN_CACHE_TTL seconds so vector store updates are
+        picked up.
+        
         Args:
             video_id: The ID of the video to create a QA chain for.
+            include_sources: Whether the chain returns its source documents.
+            retrieval_k: Number of chunks to retrieve. If None, uses the configured value.
             
         Returns:
             RetrievalQA chain if successful, None otherwise.
         """
+        retrieval_k = retrieval_k or self.config.retrieval_k
+        key = (video_id, include_sources, retrieval_k) + tuple(
+            getattr(self.config, name)
+            for name in self.LLM_FIELDS + self.RETRIEVER_FIELDS + self.PROMPT_FIELDS
+        )
+        with self._chain_cache_lock:
+            entry = self._chain_cache.get(key)
+            if entry and time.monotonic() - entry[0] < self.CHAIN_CACHE_TTL:
+                self._chain_cache.move_to_end(key)
+                self._chain_cache_stats["hits"] += 1
+                return entry[1]
+            self._chain_cache_stats["misses"] += 1
+        
+        qa_chain = self._build_qa_chain(video_id, include_sources, retrieval_k)
+        if qa_chain is None:
+            return None
+        
+        with self._chain_cache_lock:
+            self._chain_cache[key] = (time.monotonic(), qa_chain)
+            self._chain_cache.move_to_end(key)
+            while len(self._chain_cache) > self.CHAIN_CACHE_SIZE:
+                self._chain_cache.popitem(last=False)
+        self._remember_hot_video(video_id)
+        return qa_chain
+    
+    @classmethod
+    def load_hot_videos(cls) -> List[int]:
+        """
+        Load the IDs of videos whose QA chains were recently built.
+        
+        Returns:
+            Video IDs, most recently used first.
+        """
+        try:
+            with open(cls.HOT_VIDEOS_FILE) as f:
+                return [int(video_id) for video_id in json.load(f)]
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Could not read hot videos file: {e}")
+            return []
+    
+    def _remember_hot_video(self, video_id: int) -> None:
+        """Record a video as recently used, rewriting the hot videos file only when the set changes."""
+        cls = type(self)
+        with cls._hot_videos_lock:
+            if cls._hot_videos is None:
+                cls._hot_videos = self.load_hot_videos()
+            previous = cls._hot_videos
+            cls._hot_videos = ([video_id] + [v for v in previous if v != video_id])[:self.HOT_VIDEOS_LIMIT]
+            if set(cls._hot_videos) == set(previous):
+                return
+            try:
+                self.HOT_VIDEOS_FILE.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.HOT_VIDEOS_FILE.with_suffix(".tmp")
+                with open(tmp_file, "w") as f:
+                    json.dump(cls._hot_videos, f)
+                os.replace(tmp_file, self.HOT_VIDEOS_FILE)
+            except OSError as e:
+                logger.warning(f"Could not write hot videos file: {e}")
+    
+    def _build_qa_chain(self, video_id: int, include_sources: bool, retrieval_k: int) -> Optional[RetrievalQA]:
+        """Build a RetrievalQA chain over the video's vector store."""
         logger.debug(f"Creating QA chain for video {video_id}")
         
         try:
@@ -121,21 +408,24 @@ Answer based on the video content:"""
                 logger.warning(f"No vector store found for video {video_id}")
                 return None
             
-            # Create retriever with configured parameters
+            # Create retriever with configured parameters; MMR drops near-duplicate
+            # transcript chunks so the k retrieved chunks cover more content
+            search_kwargs = {"k": retrieval_k}
+            if self.config.search_type == "mmr":
+                search_kwargs["fetch_k"] = max(self.config.fetch_k, retrieval_k)
+                search_kwargs["lambda_mult"] = self.config.lambda_mult
             retriever = vectorstore.as_retriever(
-                search_kwargs={"k": self.config.retrieval_k}
+                search_type=self.config.search_type,
+                search_kwargs=search_kwargs
             )
             
-            # Create prompt template
-            prompt_template = self._create_prompt_template()
-            
             # Build QA chain with custom prompt
             qa_chain = RetrievalQA.from_chain_type(
                 llm=self.llm,
                 chain_type="stuff",
                 retriever=retriever,
-                return_source_documents=True,
-                chain_type_kwargs={"prompt": prompt_template}
+                return_source_documents=include_sources,
+                chain_type_kwargs={"prompt": self.prompt_template}
             )
             
             logger.info(f"Successfully created QA chain for video {video_id}")
@@ -145,75 +435,374 @@ Answer based on the video content:"""
             logger.error(f"Failed to create QA chain for video {video_id}: {e}")
             return None
     
-    def ask_question(self, video_id: int, question: str) -> QAResponse:
+    def _retrieval_k_for(self, question: str) -> int:
+        """
+        Pick how many chunks to retrieve for a question.
+        
+        Short, broad questions get more context; long, specific ones need less,
+        which keeps their prompts smaller.
+        
+        Args:
+            question: The question being asked.
+            
+        Returns:
+            Number of chunks to retrieve.
+        """
+        k = self.config.retrieval_k
+        if not self.config.adaptive_retrieval:
+            return k
+        
+        length = len(question.strip())
+        if length < self.config.short_question_chars:
+            return k + 2
+        if length > self.config.long_question_chars:
+            return max(1, k - 1)
+        return k
+    
+    def warmup(self, video_ids: List[int], max_workers: int = 8) -> int:
+        """
+        Build and cache QA chains for the given videos ahead of the first question.
+        
+        Args:
+            video_ids: IDs of the videos to warm up.
+            max_workers: Number of chains to build concurrently.
+            
+        Returns:
+            Number of videos whose QA chain is ready.
+        """
+        if not video_ids:
+            return 0
+        
+        # Loading vector stores is I/O bound, so threads build chains in parallel
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            chains = list(executor.map(self.get_qa_chain, video_ids))
+        
+        ready = sum(chain is not None for chain in chains)
+        logger.info(f"Warmed up QA chains for {ready}/{len(video_ids)} videos")
+        return ready
+    
+    def ask_question(self, video_id: int, question: str, include_sources: bool = True) -> QAResponse:
         """
         Ask a question about a video.
         
         Args:
             video_id: The ID of the video to ask about.
             question: The question to ask.
+            include_sources: Whether to retrieve and format source citations.
             
         Returns:
             QAResponse object with the answer and sources.
         """
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         logger.info(f"Processing question for video {video_id}: {question[:50]}...")
         
         # Validate inputs
         if not question or not question.strip():
-            return QAResponse(
-                success=False,
-                answer="Please provide a valid question.",
-                sources=[],
-                error_message="Empty question provided"
-            )
+            return self._invalid_question_response()
+        
+        # Serve repeated or near-identical questions from the response cache
+        normalized_question = " ".join(question.lower().split())
+        question_embedding = None
+        if self.config.response_cache:
+            cached, question_embedding = self._get_cached_response(video_id, normalized_question)
+            if cached:
+                logger.info(f"Response cache hit for video {video_id}")
+                return self._copy_response(cached, time.perf_counter() - start_time)
         
         # Get QA chain
-        qa_chain = self.get_qa_chain(video_id)
+        qa_chain = self.get_qa_chain(video_id, include_sources, self._retrieval_k_for(question))
         
         if not qa_chain:
-            return QAResponse(
-                success=False,
-                answer="Sorry, I cannot answer questions about this video. The transcript may not be available or processed yet.",
-                sources=[],
-                error_message="No QA chain available for this video"
-            )
+            return self._no_chain_response()
         
         try:
             # Execute the question
             result = qa_chain({"query": question.strip()})
             
-            answer = result["result"]
-            source_documents = result.get("source_documents", [])
+            response = self._build_response(result, start_time)
+            # Answers without sources would serve later callers that want them
+            if self.config.response_cache and include_sources:
+                self._cache_response(video_id, normalized_question, question_embedding, response)
+            return response
             
-            logger.info(f"Found {len(source_documents)} source documents")
+        except Exception as e:
+            return self._build_error_response(e, start_time)
+    
+    def ask_question_stream(self, video_id: int, question: str) -> Iterator[str]:
+        """
+        Ask a question about a video and yield the answer as it is generated.
+        
+        Retrieval runs up front, then answer tokens are yielded as the LLM
+        produces them. Use ask_question when the full QAResponse with sources
+        is needed.
+        
+        Args:
+            video_id: The ID of the video to ask about.
+            question: The question to ask.
             
-            # Format sources
-            formatted_sources = self._format_sources(source_documents)
+        Yields:
+            Pieces of the answer text.
             
-            processing_time = time.time() - start_time
+        Raises:
+            Exception: Retrieval or LLM errors, raised while iterating so the
+                caller can report them outside the answer text.
+        """
+        logger.info(f"Streaming answer for video {video_id}: {question[:50]}...")
+        
+        if not question or not question.strip():
+            yield self._invalid_question_response().answer
+            return
+        
+        qa_chain = self.get_qa_chain(video_id)
+        if not qa_chain:
+            yield self._no_chain_response().answer
+            return
+        
+        source_documents = qa_chain.retriever.get_relevant_documents(question.strip())
+        context = "\n\n".join(doc.page_content for doc in source_documents)
+        messages = self.prompt_template.format_messages(
+            context=context,
+            question=question.strip()
+        )
+        
+        for chunk in self.llm.stream(messages):
+            if chunk.content:
+                yield chunk.content
+    
+    async def aask_question(self, video_id: int, question: str, include_sources: bool = True) -> QAResponse:
+        """
+        Ask a question about a video without blocking the event loop.
+        
+        Args:
+            video_id: The ID of the video to ask about.
+            question: The question to ask.
+            include_sources: Whether to retrieve and format source citations.
             
-            return QAResponse(
-                success=True,
-                answer=answer,
-                sources=formatted_sources,
-                processing_time=processing_time
+        Returns:
+            QAResponse object with the answer and sources.
+        """
+        start_time = time.perf_counter()
+        
+        logger.info(f"Processing question for video {video_id}: {question[:50]}...")
+        
+        if not question or not question.strip():
+            return self._invalid_question_response()
+        
+        normalized_question = " ".join(question.lower().split())
+        question_embedding = None
+        if self.config.response_cache:
+            cached, question_embedding = await asyncio.to_thread(
+                self._get_cached_response, video_id, normalized_question
             )
+            if cached:
+                logger.info(f"Response cache hit for video {video_id}")
+                return self._copy_response(cached, time.perf_counter() - start_time)
+        
+        qa_chain = await asyncio.to_thread(
+            self.get_qa_chain, video_id, include_sources, self._retrieval_k_for(question)
+        )
+        if not qa_chain:
+            return self._no_chain_response()
+        
+        try:
+            result = await qa_chain.ainvoke({"query": question.strip()})
+            
+            response = self._build_response(result, start_time)
+            if self.config.response_cache and include_sources:
+                await asyncio.to_thread(
+                    self._cache_response, video_id, normalized_question, question_embedding, response
+                )
+            return response
             
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"Error answering question: {str(e)}"
-            logger.error(error_msg)
+            return self._build_error_response(e, start_time)
+    
+    def ask_questions_batch(self, video_id: int, questions: List[str]) -> List[QAResponse]:
+        """
+        Ask several questions about a video concurrently.
+        
+        Args:
+            video_id: The ID of the video to ask about.
+            questions: The questions to ask.
+            
+        Returns:
+            List of QAResponse objects in the same order as the questions.
+        """
+        start_time = time.perf_counter()
+        
+        logger.info(f"Processing {len(questions)} questions for video {video_id}")
+        
+        responses: List[Optional[QAResponse]] = [None] * len(questions)
+        pending = []
+        
+        for index, question in enumerate(questions):
+            if not question or not question.strip():
+                responses[index] = self._invalid_question_response()
+                continue
+            
+            normalized_question = " ".join(question.lower().split())
+            question_embedding = None
+            if self.config.response_cache:
+                cached, question_embedding = self._get_cached_response(video_id, normalized_question)
+                if cached:
+                    responses[index] = self._copy_response(cached, time.perf_counter() - start_time)
+                    continue
+            pending.append((index, question.strip(), normalized_question, question_embedding))
+        
+        if not pending:
+            return responses
+        
+        qa_chain = self.get_qa_chain(video_id)
+        if not qa_chain:
+            for index, *_ in pending:
+                responses[index] = self._no_chain_response()
+            return responses
+        
+        # One chain, many questions: requests run concurrently up to max_concurrency
+        results = qa_chain.batch(
+            [{"query": question} for _, question, _, _ in pending],
+            config={"max_concurrency": self.config.max_concurrency},
+            return_exceptions=True
+        )
+        
+        for (index, _, normalized_question, question_embedding), result in zip(pending, results):
+            if isinstance(result, Exception):
+                responses[index] = self._build_error_response(result, start_time)
+                continue
+            response = self._build_response(result, start_time)
+            if self.config.response_cache:
+                self._cache_response(video_id, normalized_question, question_embedding, response)
+            responses[index] = response
+        
+        return responses
+    
+    def _build_response(self, result: Dict[str, Any], start_time: float) -> QAResponse:
+        """Build a successful QAResponse from a QA chain result."""
+        answer = result["result"]
+        source_documents = result.get("source_documents")
+        
+        if source_documents is not None:
+            logger.info(f"Found {len(source_documents)} source documents")
+        
+        return QAResponse(
+            success=True,
+            answer=answer,
+            sources=self._format_sources(source_documents) if source_documents else [],
+            processing_time=time.perf_counter() - start_time
+        )
+    
+    def _build_error_response(self, error: Exception, start_time: float) -> QAResponse:
+        """Build a failed QAResponse for an error raised while answering."""
+        processing_time = time.perf_counter() - start_time
+        error_msg = f"Error answering question: {str(error)}"
+        logger.error(error_msg)
+        
+        return QAResponse(
+            success=False,
+            answer=f"Sorry, I encountered an error: {str(error)}",
+            sources=[],
+            processing_time=processing_time,
+            error_message=error_msg
+        )
+    
+    def _invalid_question_response(self) -> QAResponse:
+        """Response returned for an empty question."""
+        return QAResponse(
+            success=False,
+            answer="Please provide a valid question.",
+            sources=[],
+            error_message="Empty question provided"
+        )
+    
+    def _no_chain_response(self) -> QAResponse:
+        """Response returned when no QA chain can be built for the video."""
+        return QAResponse(
+            success=False,
+            answer="Sorry, I cannot answer questions about this video. The transcript may not be available or processed yet.",
+            sources=[],
+            error_message="No QA chain available for this video"
+        )
+    
+    def _embed_question(self, question: str) -> Optional[np.ndarray]:
+        """Embed a question as a unit vector, or return None if embedding fails."""
+        try:
+            embedding = np.asarray(
+                self.vector_store_manager.embeddings.embed_query(question), dtype=np.float32
+            )
+            return embedding / np.linalg.norm(embedding)
+        except Exception as e:
+            logger.warning(f"Could not embed question for response cache: {e}")
+            return None
+    
+    def _response_cache_key(self, video_id: int) -> Tuple[int, tuple]:
+        """Key cached answers by video and the config fields that shape them."""
+        return video_id, tuple(getattr(self.config, field) for field in self.ANSWER_FIELDS)
+    
+    @staticmethod
+    def _copy_response(response: QAResponse, processing_time: float) -> QAResponse:
+        """Copy a response so callers and the cache never share mutable sources."""
+        return replace(
+            response,
+            sources=[dict(source) for source in response.sources],
+            processing_time=processing_time
+        )
+    
+    def _get_cached_response(self, video_id: int, question: str) -> Tuple[Optional[QAResponse], Optional[np.ndarray]]:
+        """
+        Look up a cached response by exact question, then by embedding similarity.
+        
+        Args:
+            video_id: The ID of the video being asked about.
+            question: The normalized question text.
             
-            return QAResponse(
-                success=False,
-                answer=f"Sorry, I encountered an error: {str(e)}",
-                sources=[],
-                processing_time=processing_time,
-                error_message=error_msg
+        Returns:
+            Tuple of (cached response or None, question embedding or None).
+        """
+        with _RESPONSE_CACHE_LOCK:
+            video_cache = _RESPONSE_CACHE.get(self._response_cache_key(video_id))
+            cached = video_cache.get_exact(question) if video_cache else None
+        if cached or not video_cache:
+            return cached, None
+        
+        embedding = self._embed_question(question)
+        if embedding is None:
+            return None, None
+        
+        with _RESPONSE_CACHE_LOCK:
+            cached = video_cache.get_similar(embedding, self.config.semantic_cache_threshold)
+        return cached, embedding
+    
+    def _cache_response(
+        self,
+        video_id: int,
+        question: str,
+        embedding: Optional[np.ndarray],
+        response: QAResponse
+    ) -> None:
+        """Store a successful response in the process-wide response cache."""
+        if embedding is None:
+            embedding = self._embed_question(question)
+        with _RESPONSE_CACHE_LOCK:
+            video_cache = _RESPONSE_CACHE.setdefault(
+                self._response_cache_key(video_id),
+                _VideoResponseCache(self.config.response_cache_size, self.config.response_cache_ttl)
             )
+            video_cache.add(question, embedding, self._copy_response(response, response.processing_time))
+    
+    def clear_response_cache(self, video_id: Optional[int] = None) -> None:
+        """
+        Clear cached responses for one video, or for all videos.
+        
+        Args:
+            video_id: The ID of the video to clear. If None, clears every video.
+        """
+        with _RESPONSE_CACHE_LOCK:
+            if video_id is None:
+                _RESPONSE_CACHE.clear()
+            else:
+                for key in [key for key in _RESPONSE_CACHE if key[0] == video_id]:
+                    del _RESPONSE_CACHE[key]
     
     def _format_sources(self, source_documents: List[Document]) -> List[Dict[str, Any]]:
         """
@@ -225,29 +814,31 @@ Answer based on the video content:"""
         Returns:
             List of formatted source dictionaries.
         """
-        formatted_sources = []
+        chunk_size = self.config.chunk_size
         
-        for doc in source_documents[:self.config.max_source_docs]:
-            metadata = doc.metadata
-            content = doc.page_content
-            
-            # Truncate content if too long
-            if len(content) > self.config.chunk_size:
-                content = content[:self.config.chunk_size] + "..."
-            
-            # Extract timestamp information
-            timestamp = metadata.get("timestamp", "00:00")
-            start_time = metadata.get("start_time", metadata.get("approximate_start_time", 0))
-            
-            formatted_sources.append({
-                "content": content,
-                "timestamp": timestamp,
+        def truncate(content: str) -> str:
+            return content if len(content) <= chunk_size else content[:chunk_size] + "..."
+        
+        def source(doc: Document) -> Dict[str, Any]:
+            start_time = self._source_start_time(doc.metadata)
+            return {
+                "content": truncate(doc.page_content),
+                # Stores written before chunk metadata was compacted still carry the string
+                "timestamp": doc.metadata.get("timestamp") or format_timestamp(start_time),
                 "start_time": start_time,
-                "video_id": metadata.get("video_id"),
-                "source": metadata.get("source", "transcript")
-            })
+                "video_id": doc.metadata.get("video_id"),
+                "source": doc.metadata.get("source", "transcript")
+            }
         
-        return formatted_sources
+        return [source(doc) for doc in islice(source_documents, self.config.max_source_docs)]
+    
+    @staticmethod
+    def _source_start_time(metadata: Dict[str, Any]) -> float:
+        """Get a source's start time, falling back to the approximate chunk start."""
+        start_time = metadata.get("start_time")
+        if start_time is None:
+            start_time = metadata.get("approximate_start_time", 0)
+        return start_time
     
     def ask_question_legacy(self, video_id: int, question: str) -> Dict[str, Any]:
         """
@@ -268,20 +859,32 @@ Answer based on the video content:"""
             "sources": response.sources
         }
     
-    def clear_cache(self) -> None:
-        """Clear the QA chain cache."""
-        self.get_qa_chain.cache_clear()
+    def clear_cache(self, video_id: Optional[int] = None) -> None:
+        """
+        Clear the QA chain cache and the response cache.
+        
+        Args:
+            video_id: The ID of the video to clear. If None, clears every video.
+        """
+        with self._chain_cache_lock:
+            if video_id is None:
+                self._chain_cache.clear()
+            else:
+                for key in [key for key in self._chain_cache if key[0] == video_id]:
+                    del self._chain_cache[key]
+        self.clear_response_cache(video_id)
         logger.info("QA chain cache cleared")
     
     def get_cache_info(self) -> Dict[str, Any]:
         """Get information about the QA chain cache."""
-        cache_info = self.get_qa_chain.cache_info()
-        return {
-            "hits": cache_info.hits,
-            "misses": cache_info.misses,
-            "current_size": cache_info.currsize,
-            "max_size": cache_info.maxsize
-        }
+        with self._chain_cache_lock:
+            return {
+                "hits": self._chain_cache_stats["hits"],
+                "misses": self._chain_cache_stats["misses"],
+                "current_size": len(self._chain_cache),
+                "max_size": self.CHAIN_CACHE_SIZE,
+                "ttl_seconds": self.CHAIN_CACHE_TTL
+            }
     
     def update_config(self, new_config: QAConfig) -> None:
         """
@@ -290,10 +893,22 @@ Answer based on the video content:"""
         Args:
             new_config: New configuration object.
         """
+        old_config = self.config
         self.config = new_config
-        self._initialize_llm()
-        self.clear_cache()  # Clear cache when config changes
-        logger.info("Configuration updated and cache cleared")
+        changed = {
+            field.name for field in fields(QAConfig)
+            if getattr(old_config, field.name) != getattr(new_config, field.name)
+        }
+        
+        # Only rebuild what the changed fields actually affect
+        if changed & set(self.LLM_FIELDS):
+            # Recreated lazily on next use
+            self.__dict__.pop("llm", None)
+        if changed & set(self.PROMPT_FIELDS):
+            self.prompt_template = self._build_prompt_template()
+        # Shared chain and response caches are keyed by these fields, so entries built
+        # under the old config are simply no longer hit and age out via TTL/LRU
+        logger.info(f"Configuration updated: {', '.join(sorted(changed)) or 'no changes'}")
     
     def validate_video_availability(self, video_id: int) -> bool:
         """
@@ -6,12 +6,24 @@ and AI-powered analysis of video transcripts. It creates meaningful
 section breaks based on content analysis and topic changes.
 """
 
+import os
+import dbm
+import time
+import asyncio
+import hashlib
+import json
 import logging
 import re
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+import threading
+from bisect import bisect_right
+from operator import attrgetter
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 
+import numpy as np
+
 from .qa_manager import QAManager, QAConfig
 
 # Configure logging
@@ -34,9 +46,19 @@ class SectionConfig:
     min_section_duration: int = 30  # Minimum 30 seconds per section
     strategy: SectionStrategy = SectionStrategy.AI_ANALYSIS
     qa_config: Optional[QAConfig] = None
+    # Listing section titles is a simple task; route it to a cheaper, faster model
+    model_name: str = "gpt-4o-mini"
+    temperature: float = 0.0
+    # Reuse a video's titles when it is re-ingested with a near-identical transcript
+    semantic_cache: bool = True
+    semantic_cache_threshold: float = 0.97
+    semantic_cache_dir: str = "storage/section_cache"
+    # Reuse the full result for an unchanged transcript, prompt, model and duration
+    result_cache: bool = True
+    result_cache_path: str = "storage/section_cache/section_results"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Section:
     """Represents a video section."""
     title: str
@@ -58,6 +80,221 @@ class SectionGenerationResult:
     error_message: Optional[str] = None
 
 
+class SemanticSectionCache:
+    """
+    Section titles cached per video by transcript fingerprint, persisted to disk.
+    
+    A transcript's fingerprint is the normalized centroid of its chunk
+    embeddings. Hits are limited to the same video and model: a video
+    re-ingested with small transcript edits keeps almost the same centroid and
+    reuses its titles, while centroids of different videos on similar topics
+    sit too close together to tell apart safely.
+    """
+    
+    MAX_ENTRIES = 1000
+    
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache, loading any entries saved in cache_dir.
+        
+        Args:
+            cache_dir: Directory holding the cache file.
+        """
+        self.cache_file = Path(cache_dir) / "section_titles.npz"
+        self._lock = threading.Lock()
+        # (video_id, model_name) -> (fingerprint, titles), oldest first
+        self._entries: Dict[Tuple[int, str], Tuple[np.ndarray, List[str]]] = {}
+        
+        if self.cache_file.exists():
+            try:
+                with np.load(self.cache_file, allow_pickle=False) as data:
+                    for i, (video_id, model_name, titles) in enumerate(json.loads(str(data["entries"]))):
+                        self._entries[(video_id, model_name)] = (data[f"centroid_{i}"], titles)
+            except Exception as e:
+                logger.warning(f"Could not read section cache: {e}")
+    
+    def lookup(
+        self,
+        video_id: int,
+        model_name: str,
+        centroid: np.ndarray,
+        threshold: float
+    ) -> Optional[List[str]]:
+        """
+        Find titles cached for the same video and model with a similar transcript.
+        
+        Args:
+            video_id: Video the titles must have been generated for.
+            model_name: Model that must have produced the cached titles.
+            centroid: Normalized transcript fingerprint.
+            threshold: Minimum cosine similarity for a hit.
+            
+        Returns:
+            Cached section titles on a hit, None otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get((video_id, model_name))
+        if entry is None:
+            return None
+        
+        cached_centroid, titles = entry
+        # Fingerprints from another embedding backend have a different size
+        if cached_centroid.shape != centroid.shape or float(cached_centroid @ centroid) < threshold:
+            return None
+        return list(titles)
+    
+    def add(self, video_id: int, model_name: str, centroid: np.ndarray, titles: List[str]) -> None:
+        """
+        Store titles for a video's transcript fingerprint and persist the cache.
+        
+        Args:
+            video_id: Video the titles were generated for.
+            model_name: Model that produced the titles.
+            centroid: Normalized transcript fingerprint.
+            titles: Generated section titles.
+        """
+        with self._lock:
+            key = (video_id, model_name)
+            self._entries.pop(key, None)
+            self._entries[key] = (np.asarray(centroid, dtype=np.float32), list(titles))
+            while len(self._entries) > self.MAX_ENTRIES:
+                del self._entries[next(iter(self._entries))]
+            
+            # Titles as JSON and fingerprints as float arrays: nothing is unpickled on load
+            entries = [[entry_video, entry_model, entry_titles]
+                       for (entry_video, entry_model), (_, entry_titles) in self._entries.items()]
+            centroids = {f"centroid_{i}": fingerprint for i, (fingerprint, _) in enumerate(self._entries.values())}
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.cache_file.with_suffix(".tmp")
+                with open(tmp_file, 'wb') as f:
+                    np.savez(f, entries=np.array(json.dumps(entries)), **centroids)
+                os.replace(tmp_file, self.cache_file)
+            except OSError as e:
+                logger.warning(f"Could not write section cache: {e}")
+
+
+# Section caches shared by all SectionGenerator instances, keyed by directory
+_SECTION_CACHES: Dict[str, SemanticSectionCache] = {}
+_SECTION_CACHES_LOCK = threading.Lock()
+
+
+def _get_section_cache(cache_dir: str) -> SemanticSectionCache:
+    """Get the process-wide section cache for a directory."""
+    with _SECTION_CACHES_LOCK:
+        if cache_dir not in _SECTION_CACHES:
+            _SECTION_CACHES[cache_dir] = SemanticSectionCache(cache_dir)
+        return _SECTION_CACHES[cache_dir]
+
+
+class SectionResultStore:
+    """
+    Section generation results persisted as JSON in a dbm file.
+    
+    Keys hash the transcript's content-derived chunk IDs together with the
+    query, the Q&A chain configuration and the duration, so any change to
+    those misses the store instead of serving stale sections.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+        
+        Args:
+            path: dbm file path (the backend may add its own suffix).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional["SectionGenerationResult"]:
+        """
+        Load a stored result.
+        
+        Args:
+            key: Result key.
+            
+        Returns:
+            The stored result, or None if missing or unreadable.
+        """
+        try:
+            with self._lock, dbm.open(self.path, "r") as db:
+                data = db.get(key)
+        except dbm.error:
+            # Nothing has been stored yet
+            return None
+        
+        if data is None:
+            return None
+        try:
+            stored = json.loads(data)
+            return SectionGenerationResult(
+                success=stored["success"],
+                sections=[
+                    Section(
+                        title=section["title"],
+                        start_time=section["start_time"],
+                        end_time=section["end_time"],
+                        duration=section["duration"],
+                        confidence=section["confidence"],
+                        strategy_used=SectionStrategy(section["strategy_used"])
+                    )
+                    for section in stored["sections"]
+                ],
+                total_duration=stored["total_duration"],
+                strategy_used=SectionStrategy(stored["strategy_used"]),
+                processing_time=stored.get("processing_time"),
+                error_message=stored.get("error_message")
+            )
+        except Exception as e:
+            logger.warning(f"Could not read section result store: {e}")
+            return None
+    
+    def put(self, key: str, result: "SectionGenerationResult") -> None:
+        """
+        Store a result.
+        
+        Args:
+            key: Result key.
+            result: Result to store.
+        """
+        try:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps({
+                "success": result.success,
+                "sections": [
+                    {
+                        "title": section.title,
+                        "start_time": section.start_time,
+                        "end_time": section.end_time,
+                        "duration": section.duration,
+                        "confidence": section.confidence,
+                        "strategy_used": section.strategy_used.value
+                    }
+                    for section in result.sections
+                ],
+                "total_duration": result.total_duration,
+                "strategy_used": result.strategy_used.value,
+                "processing_time": result.processing_time,
+                "error_message": result.error_message
+            })
+            with self._lock, dbm.open(self.path, "c") as db:
+                db[key] = data
+        except Exception as e:
+            logger.warning(f"Could not write section result store: {e}")
+
+
+# Result stores shared by all SectionGenerator instances, keyed by path
+_RESULT_STORES: Dict[str, SectionResultStore] = {}
+
+
+def _get_result_store(path: str) -> SectionResultStore:
+    """Get the process-wide section result store for a path."""
+    with _SECTION_CACHES_LOCK:
+        if path not in _RESULT_STORES:
+            _RESULT_STORES[path] = SectionResultStore(path)
+        return _RESULT_STORES[path]
+
+
 class SectionGenerator:
     """
     Generates intelligent video sections using AI.
@@ -66,8 +303,11 @@ class SectionGenerator:
     based on content analysis, topic changes, and natural speech patterns.
     """
     
-    # Default prompt template for section generation
-    SECTION_PROMPT_TEMPLATE = """Analyze this video transcript and create 3-8 main sections that best organize the content.
+    # Static section instructions, sent as the system message so every call
+    # shares the same cacheable prompt prefix
+    SECTION_SYSTEM_PROMPT = """You are a helpful AI assistant that organizes videos into sections based on their transcripts.
+
+Analyze the video transcript context provided by the user and create 3-8 main sections that best organize the content.
 
 For each section, provide a clear, descriptive title (3-8 words) that captures the main topic.
 
@@ -81,21 +321,33 @@ Format your response as a numbered list like this:
 5. Summary and Conclusions
 
 Only provide the titles, one per line, numbered. Do not include any other text."""
-
+    
+    # Short fixed query placed after the retrieved context
+    SECTION_QUERY = "Create the main sections for this video."
+    
+    # One non-blank response line, without its "1." / "1)" / bullet prefix
+    _TITLE_LINE_RE = re.compile(r'^[ \t]*(?:\d+[.)]|[-•*])?[ \t]*(\S.*?)[ \t\r]*$', re.MULTILINE)
+    _WHITESPACE_RE = re.compile(r'\s+')
+    # Only digits and punctuation (e.g. a bare "10."), or generic section names
+    _INVALID_TITLE_RE = re.compile(
+        r'^(?:[\d\W_]+|(?:section|part|chapter)\s*\d+)$',
+        re.IGNORECASE
+    )
+    
     # Fallback section templates
-    FALLBACK_SECTIONS = [
+    FALLBACK_SECTIONS = (
         "Introduction",
         "Main Content", 
         "Key Points",
         "Conclusion"
-    ]
+    )
     
-    DEFAULT_SECTIONS = [
+    DEFAULT_SECTIONS = (
         "Video Introduction",
         "Main Discussion",
         "Key Points", 
         "Summary"
-    ]
+    )
     
     def __init__(self, config: Optional[SectionConfig] = None):
         """
@@ -105,13 +357,24 @@ Only provide the titles, one per line, numbered. Do not include any other text."
             config: Optional configuration object. If None, uses default settings.
         """
         self.config = config or SectionConfig()
-        self.qa_manager = QAManager(self.config.qa_config)
+        self.qa_manager = QAManager(self._section_qa_config(self.config))
         
         logger.info(f"SectionGenerator initialized with strategy: {self.config.strategy.value}")
     
+    @staticmethod
+    def _section_qa_config(config: SectionConfig) -> QAConfig:
+        """Build the Q&A configuration used for section generation with the section model."""
+        return replace(
+            config.qa_config or QAConfig(),
+            model_name=config.model_name,
+            temperature=config.temperature,
+            system_prompt=SectionGenerator.SECTION_SYSTEM_PROMPT,
+            prompt_cache_key="video_sections_v1"
+        )
+    
     def _create_section_prompt(self) -> str:
-        """Create the prompt for section generation."""
-        return self.SECTION_PROMPT_TEMPLATE
+        """Create the query for section generation."""
+        return self.SECTION_QUERY
     
     def generate_sections(self, video_id: int, duration: Optional[float] = None) -> SectionGenerationResult:
         """
@@ -124,7 +387,6 @@ Only provide the titles, one per line, numbered. Do not include any other text."
         Returns:
             SectionGenerationResult with generated sections and metadata.
         """
-        import time
         start_time = time.time()
         
         logger.info(f"Generating sections for video {video_id}")
@@ -133,87 +395,246 @@ Only provide the titles, one per line, numbered. Do not include any other text."
         total_duration = duration or self.config.default_duration
         
         try:
-            # Try AI-based section generation first
+            # Try AI-based section generation first; any failure falls back to time-based
             if self.config.strategy == SectionStrategy.AI_ANALYSIS:
                 result = self._generate_sections_with_ai(video_id, total_duration)
                 if result.success:
-                    processing_time = time.time() - start_time
-                    result.processing_time = processing_time
+                    result.processing_time = time.time() - start_time
                     return result
+        except Exception as e:
+            logger.error(f"Error in AI section generation: {e}")
+        
+        try:
+            return self._fallback_to_time_based(video_id, total_duration, start_time)
+        except Exception as e:
+            return self._error_result(e, total_duration, start_time)
+    
+    async def agenerate_sections(self, video_id: int, duration: Optional[float] = None) -> SectionGenerationResult:
+        """
+        Generate intelligent sections for a video without blocking the event loop.
+        
+        Args:
+            video_id: The ID of the video to generate sections for.
+            duration: Optional video duration in seconds. If None, uses default.
             
-            # Fallback to time-based generation
-            logger.warning(f"AI section generation failed for video {video_id}, using time-based fallback")
-            result = self._generate_sections_time_based(total_duration)
-            processing_time = time.time() - start_time
-            result.processing_time = processing_time
-            return result
-            
+        Returns:
+            SectionGenerationResult with generated sections and metadata.
+        """
+        start_time = time.time()
+        
+        logger.info(f"Generating sections for video {video_id}")
+        
+        total_duration = duration or self.config.default_duration
+        
+        try:
+            if self.config.strategy == SectionStrategy.AI_ANALYSIS:
+                result = await self._agenerate_sections_with_ai(video_id, total_duration)
+                if result.success:
+                    result.processing_time = time.time() - start_time
+                    return result
+        except Exception as e:
+            logger.error(f"Error in AI section generation: {e}")
+        
+        try:
+            return self._fallback_to_time_based(video_id, total_duration, start_time)
         except Exception as e:
-            processing_time = time.time() - start_time
-            error_msg = f"Error generating sections: {str(e)}"
-            logger.error(error_msg)
+            return self._error_result(e, total_duration, start_time)
+    
+    async def agenerate_sections_batch(
+        self,
+        video_ids: List[int],
+        durations: Optional[List[Optional[float]]] = None,
+        max_concurrency: int = 10
+    ) -> List[SectionGenerationResult]:
+        """
+        Generate sections for several videos concurrently.
+        
+        Args:
+            video_ids: IDs of the videos to generate sections for.
+            durations: Optional per-video durations, aligned with video_ids.
+            max_concurrency: Maximum number of videos processed at once.
             
-            return SectionGenerationResult(
-                success=False,
-                sections=self._create_fallback_sections(total_duration),
-                total_duration=total_duration,
-                strategy_used=SectionStrategy.FALLBACK,
-                processing_time=processing_time,
-                error_message=error_msg
-            )
+        Returns:
+            List of SectionGenerationResult in the same order as video_ids.
+        """
+        durations = durations or [None] * len(video_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def generate_one(video_id: int, duration: Optional[float]) -> SectionGenerationResult:
+            async with semaphore:
+                return await self.agenerate_sections(video_id, duration)
+        
+        return list(await asyncio.gather(
+            *(generate_one(video_id, duration) for video_id, duration in zip(video_ids, durations))
+        ))
+    
+    def _fallback_to_time_based(self, video_id: int, duration: float, start_time: float) -> SectionGenerationResult:
+        """Fall back to time-based sections after AI generation failed."""
+        logger.warning(f"AI section generation failed for video {video_id}, using time-based fallback")
+        result = self._generate_sections_time_based(duration)
+        result.processing_time = time.time() - start_time
+        return result
+    
+    def _error_result(self, error: Exception, duration: float, start_time: float) -> SectionGenerationResult:
+        """Build the fallback result for an unexpected section generation error."""
+        error_msg = f"Error generating sections: {str(error)}"
+        logger.error(error_msg)
+        
+        return SectionGenerationResult(
+            success=False,
+            sections=self._create_fallback_sections(duration),
+            total_duration=duration,
+            strategy_used=SectionStrategy.FALLBACK,
+            processing_time=time.time() - start_time,
+            error_message=error_msg
+        )
     
     def _generate_sections_with_ai(self, video_id: int, duration: float) -> SectionGenerationResult:
-        """Generate sections using AI analysis."""
-        qa_chain = self.qa_manager.get_qa_chain(video_id)
+        """Generate sections using AI analysis; errors propagate to the caller's fallback."""
+        # Only the answer text is parsed, so skip returning source documents
+        qa_chain = self.qa_manager.get_qa_chain(video_id, include_sources=False)
         
         if not qa_chain:
-            logger.warning(f"No QA chain available for video {video_id}")
-            return SectionGenerationResult(
-                success=False,
-                sections=[],
-                total_duration=duration,
-                strategy_used=SectionStrategy.AI_ANALYSIS,
-                error_message="No QA chain available"
+            raise RuntimeError(f"No QA chain available for video {video_id}")
+        
+        result_key, cached_result = self._lookup_stored_result(video_id, qa_chain, duration)
+        if cached_result:
+            return cached_result
+        
+        # Reuse titles of a near-identical transcript before calling the LLM
+        section_titles, centroid = self._lookup_cached_titles(video_id, qa_chain)
+        
+        if not section_titles:
+            result = qa_chain({"query": self._create_section_prompt()})
+            section_titles = self._parse_and_cache_titles(video_id, result["result"], centroid)
+        
+        return self._store_result(result_key, self._ai_result(section_titles, duration))
+    
+    async def _agenerate_sections_with_ai(self, video_id: int, duration: float) -> SectionGenerationResult:
+        """Generate sections using AI analysis, awaiting the LLM call."""
+        qa_chain = await asyncio.to_thread(self.qa_manager.get_qa_chain, video_id, False)
+        
+        if not qa_chain:
+            raise RuntimeError(f"No QA chain available for video {video_id}")
+        
+        result_key, cached_result = await asyncio.to_thread(
+            self._lookup_stored_result, video_id, qa_chain, duration
+        )
+        if cached_result:
+            return cached_result
+        
+        section_titles, centroid = await asyncio.to_thread(self._lookup_cached_titles, video_id, qa_chain)
+        
+        if not section_titles:
+            result = await qa_chain.ainvoke({"query": self._create_section_prompt()})
+            section_titles = await asyncio.to_thread(
+                self._parse_and_cache_titles, video_id, result["result"], centroid
             )
         
+        return await asyncio.to_thread(
+            self._store_result, result_key, self._ai_result(section_titles, duration)
+        )
+    
+    def _lookup_stored_result(
+        self,
+        video_id: int,
+        qa_chain,
+        duration: float
+    ) -> Tuple[Optional[str], Optional[SectionGenerationResult]]:
+        """Look up a stored result for the video's exact transcript; returns (key, result)."""
+        if not self.config.result_cache:
+            return None, None
+        
         try:
-            # Use the structured prompt
-            sections_query = self._create_section_prompt()
-            result = qa_chain({"query": sections_query})
-            answer = result["result"]
-            
-            # Parse AI response
-            section_titles = self._parse_ai_response(answer)
-            
-            if not section_titles:
-                logger.warning("Failed to parse AI response, using fallback")
-                return SectionGenerationResult(
-                    success=False,
-                    sections=[],
-                    total_duration=duration,
-                    strategy_used=SectionStrategy.AI_ANALYSIS,
-                    error_message="Failed to parse AI response"
-                )
-            
-            # Create sections with timing
-            sections = self._create_sections_with_timing(section_titles, duration, SectionStrategy.AI_ANALYSIS)
-            
-            return SectionGenerationResult(
-                success=True,
-                sections=sections,
-                total_duration=duration,
-                strategy_used=SectionStrategy.AI_ANALYSIS
-            )
-            
+            # Chunk IDs hash each chunk's text and start time, so they digest the
+            # transcript without reading the documents themselves
+            stored = qa_chain.retriever.vectorstore.get(include=[])
         except Exception as e:
-            logger.error(f"Error in AI section generation: {e}")
+            logger.warning(f"Could not read transcript for section result store: {e}")
+            return None, None
+        
+        # Every field that changes the chain (model, prompt, retrieval) is part of the key
+        qa_config = self.qa_manager.config
+        digest = hashlib.sha256()
+        for text in (
+            self.SECTION_QUERY,
+            *(f"{name}={getattr(qa_config, name)!r}" for name in QAManager.CHAIN_FIELDS),
+            *sorted(stored.get("ids") or [])
+        ):
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        key = f"{video_id}:{duration}:{digest.hexdigest()}"
+        
+        result = _get_result_store(self.config.result_cache_path).get(key)
+        if result:
+            logger.info(f"Section result store hit for video {video_id}")
+        return key, result
+    
+    def _store_result(self, key: Optional[str], result: SectionGenerationResult) -> SectionGenerationResult:
+        """Persist a successful result under its key and return it."""
+        if key and result.success:
+            _get_result_store(self.config.result_cache_path).put(key, result)
+        return result
+    
+    def _lookup_cached_titles(self, video_id: int, qa_chain) -> Tuple[Optional[List[str]], Optional[np.ndarray]]:
+        """Look up titles cached for this video's transcript fingerprint; returns (titles, fingerprint)."""
+        if not self.config.semantic_cache:
+            return None, None
+        
+        centroid = self._transcript_centroid(qa_chain)
+        if centroid is None:
+            return None, None
+        
+        section_titles = _get_section_cache(self.config.semantic_cache_dir).lookup(
+            video_id, self.config.model_name, centroid, self.config.semantic_cache_threshold
+        )
+        if section_titles:
+            logger.info(f"Section cache hit for video {video_id}")
+        return section_titles, centroid
+    
+    def _parse_and_cache_titles(self, video_id: int, answer: str, centroid: Optional[np.ndarray]) -> List[str]:
+        """Parse titles from the LLM answer and cache them under the video's transcript fingerprint."""
+        section_titles = self._parse_ai_response(answer)
+        if section_titles and centroid is not None:
+            _get_section_cache(self.config.semantic_cache_dir).add(
+                video_id, self.config.model_name, centroid, section_titles
+            )
+        return section_titles
+    
+    def _ai_result(self, section_titles: Optional[List[str]], duration: float) -> SectionGenerationResult:
+        """Build the AI analysis result from parsed section titles."""
+        if not section_titles:
+            logger.warning("Failed to parse AI response, using fallback")
             return SectionGenerationResult(
                 success=False,
                 sections=[],
                 total_duration=duration,
                 strategy_used=SectionStrategy.AI_ANALYSIS,
-                error_message=str(e)
+                error_message="Failed to parse AI response"
             )
+        
+        # Create sections with timing
+        sections = self._create_sections_with_timing(section_titles, duration, SectionStrategy.AI_ANALYSIS)
+        
+        return SectionGenerationResult(
+            success=True,
+            sections=sections,
+            total_duration=duration,
+            strategy_used=SectionStrategy.AI_ANALYSIS
+        )
+    
+    def _transcript_centroid(self, qa_chain) -> Optional[np.ndarray]:
+        """Fingerprint a video's transcript as the normalized mean of its stored chunk embeddings."""
+        try:
+            stored = qa_chain.retriever.vectorstore.get(include=["embeddings"])
+            embeddings = stored.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
+                return None
+            centroid = np.asarray(embeddings, dtype=np.float32).mean(axis=0)
+            return centroid / np.linalg.norm(centroid)
+        except Exception as e:
+            logger.warning(f"Could not fingerprint transcript for section cache: {e}")
+            return None
     
     def _generate_sections_time_based(self, duration: float) -> SectionGenerationResult:
         """Generate sections based on time intervals."""
@@ -225,29 +646,11 @@ Only provide the titles, one per line, numbered. Do not include any other text."
             min(self.config.max_sections, int(duration / self.config.min_section_duration))
         )
         
-        section_duration = duration / num_sections
-        sections = []
-        
-        for i in range(num_sections):
-            start_time = i * section_duration
-            end_time = (i + 1) * section_duration
-            
-            # Use different titles based on position
-            if i == 0:
-                title = "Introduction"
-            elif i == num_sections - 1:
-                title = "Conclusion"
-            else:
-                title = f"Section {i + 1}"
-            
-            sections.append(Section(
-                title=title,
-                start_time=start_time,
-                end_time=end_time,
-                duration=section_duration,
-                confidence=0.8,
-                strategy_used=SectionStrategy.TIME_BASED
-            ))
+        # Use different titles based on position
+        titles = ["Introduction"] + [f"Section {i + 1}" for i in range(1, num_sections - 1)]
+        if num_sections > 1:
+            titles.append("Conclusion")
+        sections = self._create_sections_with_timing(titles, duration, SectionStrategy.TIME_BASED)
         
         return SectionGenerationResult(
             success=True,
@@ -258,20 +661,14 @@ Only provide the titles, one per line, numbered. Do not include any other text."
     
     def _parse_ai_response(self, response: str) -> List[str]:
         """Parse AI response to extract section titles."""
-        section_titles = []
-        lines = response.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Remove numbering and clean up
-            cleaned_line = self._clean_section_title(line)
-            
-            # Validate title
-            if self._is_valid_section_title(cleaned_line):
-                section_titles.append(cleaned_line)
+        section_titles = [
+            title
+            for title in (
+                self._WHITESPACE_RE.sub(' ', match.group(1))
+                for match in self._TITLE_LINE_RE.finditer(response)
+            )
+            if self._is_valid_section_title(title)
+        ]
         
         # Ensure we have the right number of sections
         if len(section_titles) < self.config.min_sections:
@@ -280,59 +677,30 @@ Only provide the titles, one per line, numbered. Do not include any other text."
         
         return section_titles[:self.config.max_sections]
     
-    def _clean_section_title(self, title: str) -> str:
-        """Clean and normalize section title."""
-        # Remove numbering (1., 2., etc.)
-        if re.match(r'^\d+\.', title):
-            title = re.sub(r'^\d+\.\s*', '', title)
-        elif title.startswith('-') or title.startswith('•'):
-            title = title[1:].strip()
-        
-        # Clean up extra whitespace
-        title = re.sub(r'\s+', ' ', title).strip()
-        
-        return title
-    
     def _is_valid_section_title(self, title: str) -> bool:
         """Validate if a title is suitable for a section."""
-        if not title or len(title) < 3:
-            return False
-        
-        if len(title) > 100:
+        if len(title) < 3 or len(title) > 100:
             return False
         
-        # Check for common invalid patterns
-        invalid_patterns = [
-            r'^\d+$',  # Just numbers
-            r'^[^\w\s]+$',  # Only special characters
-            r'^(section|part|chapter)\s*\d+$',  # Generic section names
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.match(pattern, title, re.IGNORECASE):
-                return False
-        
-        return True
+        # Reject common invalid patterns
+        return not self._INVALID_TITLE_RE.match(title)
     
-    def _create_sections_with_timing(self, titles: List[str], duration: float, strategy: SectionStrategy) -> List[Section]:
+    def _create_sections_with_timing(self, titles: Sequence[str], duration: float, strategy: SectionStrategy) -> List[Section]:
         """Create Section objects with proper timing."""
-        sections = []
         section_duration = duration / len(titles)
+        confidence = 1.0 if strategy == SectionStrategy.AI_ANALYSIS else 0.8
         
-        for i, title in enumerate(titles):
-            start_time = i * section_duration
-            end_time = (i + 1) * section_duration
-            
-            sections.append(Section(
+        return [
+            Section(
                 title=title,
-                start_time=start_time,
-                end_time=end_time,
+                start_time=i * section_duration,
+                end_time=(i + 1) * section_duration,
                 duration=section_duration,
-                confidence=1.0 if strategy == SectionStrategy.AI_ANALYSIS else 0.8,
+                confidence=confidence,
                 strategy_used=strategy
-            ))
-        
-        return sections
+            )
+            for i, title in enumerate(titles)
+        ]
     
     def _create_fallback_sections(self, duration: float) -> List[Section]:
         """Create fallback sections when all else fails."""
@@ -370,8 +738,7 @@ Only provide the titles, one per line, numbered. Do not include any other text."
             new_config: New configuration object.
         """
         self.config = new_config
-        if new_config.qa_config:
-            self.qa_manager.update_config(new_config.qa_config)
+        self.qa_manager.update_config(self._section_qa_config(new_config))
         logger.info("SectionGenerator configuration updated")
     
     def get_section_at_time(self, sections: List[Section], timestamp: float) -> Optional[Section]:
@@ -385,6 +752,13 @@ Only provide the titles, one per line, numbered. Do not include any other text."
         Returns:
             Section containing the timestamp, or None if not found.
         """
+        # Generated sections are sorted by start time, so binary search finds
+        # the candidate without scanning; the candidate is checked in full
+        index = bisect_right(sections, timestamp, key=attrgetter("start_time")) - 1
+        if index >= 0 and sections[index].start_time <= timestamp < sections[index].end_time:
+            return sections[index]
+        
+        # No sorted hit: the timestamp is outside every section or the list is unsorted
         for section in sections:
             if section.start_time <= timestamp < section.end_time:
                 return section
@@ -406,23 +780,28 @@ Only provide the titles, one per line, numbered. Do not include any other text."
             issues.append("No sections provided")
             return False, issues
         
-        # Check for overlapping sections
-        for i, section in enumerate(sections):
-            if section.start_time >= section.end_time:
+        count = len(sections)
+        starts = np.fromiter((section.start_time for section in sections), dtype=np.float64, count=count)
+        ends = np.fromiter((section.end_time for section in sections), dtype=np.float64, count=count)
+        durations = np.fromiter((section.duration for section in sections), dtype=np.float64, count=count)
+        
+        # Evaluate every per-section check at once, then report only flagged sections
+        bad_timing = starts >= ends
+        bad_duration = durations <= 0
+        overlaps = np.zeros(count, dtype=bool)
+        overlaps[:-1] = ends[:-1] > starts[1:]
+        
+        for i in np.flatnonzero(bad_timing | bad_duration | overlaps).tolist():
+            if bad_timing[i]:
                 issues.append(f"Section {i} has invalid timing: start >= end")
-            
-            if section.duration <= 0:
+            if bad_duration[i]:
                 issues.append(f"Section {i} has zero or negative duration")
-            
-            # Check for overlaps with next section
-            if i < len(sections) - 1:
-                next_section = sections[i + 1]
-                if section.end_time > next_section.start_time:
-                    issues.append(f"Sections {i} and {i+1} overlap")
+            if overlaps[i]:
+                issues.append(f"Sections {i} and {i+1} overlap")
         
         # Check total coverage
-        total_duration = sections[-1].end_time - sections[0].start_time
-        expected_duration = sum(section.duration for section in sections)
+        total_duration = ends[-1] - starts[0]
+        expected_duration = durations.sum()
         
         if abs(total_duration - expected_duration) > 0.1:  # Allow small floating point errors
             issues.append("Section durations don't match total duration")
@@ -444,22 +823,25 @@ Only provide the titles, one per line, numbered. Do not include any other text."
             return sections
         
         # Simple merging strategy: combine adjacent sections
+        count = len(sections)
+        sections_per_merge = count // max_sections
+        group_starts = np.arange(0, count, sections_per_merge)
+        
+        # Minimum confidence of every group in one reduction
+        confidences = np.fromiter((section.confidence for section in sections), dtype=np.float64, count=count)
+        min_confidences = np.minimum.reduceat(confidences, group_starts).tolist()
+        
         merged = []
-        sections_per_merge = len(sections) // max_sections
+        for i, confidence in zip(group_starts.tolist(), min_confidences):
+            first = sections[i]
+            last = sections[min(i + sections_per_merge, count) - 1]
+            merged.append(Section(
+                title=f"{first.title} & More",
+                start_time=first.start_time,
+                end_time=last.end_time,
+                duration=last.end_time - first.start_time,
+                confidence=confidence,
+                strategy_used=first.strategy_used
+            ))
         
-        for i in range(0, len(sections), sections_per_merge):
-            group = sections[i:i + sections_per_merge]
-            
-            if group:
-                # Create merged section
-                merged_section = Section(
-                    title=f"{group[0].title} & More",
-                    start_time=group[0].start_time,
-                    end_time=group[-1].end_time,
-                    duration=group[-1].end_time - group[0].start_time,
-                    confidence=min(section.confidence for section in group),
-                    strategy_used=group[0].strategy_used
-                )
-                merged.append(merged_section)
-        
-        return merged 
\ No newline at end of file
+        return merged
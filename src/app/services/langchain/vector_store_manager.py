@@ -6,13 +6,26 @@ including document processing, chunking strategies, and ChromaDB integration.
 """
 
 import os
+import time
+import hashlib
+import random
 import shutil
 import logging
+import threading
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 
+import chromadb
+from chromadb.config import Settings
+
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
@@ -21,6 +34,18 @@ from langchain.docstore.document import Document
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Precomputed MM:SS strings for the first hour, shared by every chunk's metadata
+_TIMESTAMP_TABLE = tuple(f"{second // 60:02d}:{second % 60:02d}" for second in range(3600))
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds into MM:SS timestamp."""
+    if 0 <= seconds < 3600:
+        return _TIMESTAMP_TABLE[int(seconds)]
+    minutes = int(seconds // 60)
+    seconds_remainder = int(seconds % 60)
+    return f"{minutes:02d}:{seconds_remainder:02d}"
+
 
 class ChunkingStrategy(Enum):
     """Strategies for text chunking."""
@@ -29,6 +54,22 @@ class ChunkingStrategy(Enum):
     PARAGRAPH = "paragraph"
 
 
+class EmbeddingBackend(Enum):
+    """Where chunk and query embeddings are computed."""
+    OPENAI = "openai"
+    LOCAL = "local"
+
+
+def _embedding_backend_from_env() -> EmbeddingBackend:
+    """Read EMBEDDING_BACKEND, falling back to OpenAI for unknown values."""
+    value = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+    try:
+        return EmbeddingBackend(value)
+    except ValueError:
+        logger.warning(f"Unknown EMBEDDING_BACKEND '{value}', using 'openai'")
+        return EmbeddingBackend.OPENAI
+
+
 @dataclass
 class VectorStoreConfig:
     """Configuration for vector store operations."""
@@ -40,6 +81,19 @@ class VectorStoreConfig:
     separators: List[str] = None
     min_chunk_size: int = 50
     max_chunk_size: int = 2000
+    # Chunk embeddings are cached here by content hash; None disables the cache
+    embedding_cache_path: Optional[str] = "storage/embed_cache"
+    # Chunks per embeddings request, and how many requests are in flight at once
+    embedding_batch_size: int = 64
+    max_concurrent_batches: int = 5
+    # Stores must be rebuilt after switching backend: the vector spaces differ
+    embedding_backend: EmbeddingBackend = field(default_factory=_embedding_backend_from_env)
+    local_embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # HNSW graph parameters for new collections; per-video corpora are small,
+    # so a sparser graph than Chroma's defaults (M=16, ef=100) keeps recall
+    hnsw_m: int = 8
+    hnsw_construction_ef: int = 64
+    hnsw_search_ef: int = 32
     
     def __post_init__(self):
         if self.separators is None:
@@ -59,18 +113,6 @@ class ProcessingResult:
     error_message: Optional[str] = None
 
 
-@dataclass
-class DocumentMetadata:
-    """Standardized document metadata."""
-    video_id: int
-    start_time: float
-    duration: float
-    timestamp: str
-    source: str
-    chunk_id: Optional[int] = None
-    approximate_start_time: Optional[float] = None
-
-
 class VectorStoreManager:
     """
     Manages vector stores for video transcripts.
@@ -79,6 +121,11 @@ class VectorStoreManager:
     document processing, chunking strategies, and ChromaDB integration.
     """
     
+    # Directory checks in flight at once when checking many videos
+    EXISTS_CHECK_WORKERS = 32
+    # Seconds a list_vector_stores result is reused while the UI polls
+    LIST_CACHE_TTL = 5.0
+    
     def __init__(self, config: Optional[VectorStoreConfig] = None):
         """
         Initialize the vector store manager.
@@ -87,40 +134,82 @@ class VectorStoreManager:
             config: Optional configuration object. If None, uses default settings.
         """
         self.config = config or VectorStoreConfig()
-        
-        # Initialize components
-        self._initialize_embeddings()
-        self._initialize_text_splitter()
-        
+        # (created_at, storage path, stores) of the last list_vector_stores call
+        self._list_cache: Optional[Tuple[float, str, List[Dict[str, Any]]]] = None
+        # One persistent Chroma client per store directory, reused across calls
+        self._chroma_clients: Dict[str, Any] = {}
+        self._chroma_clients_lock = threading.Lock()
+        
+        # Embeddings and text splitter are created on first use, so filesystem-only
+        # operations (listing, existence checks, deletion) skip their setup cost
         logger.info(f"VectorStoreManager initialized with strategy: {self.config.chunking_strategy.value}")
     
-    def _initialize_embeddings(self) -> None:
-        """Initialize the embeddings model."""
+    @cached_property
+    def _base_embeddings(self):
+        """Uncached embeddings model for the configured backend, created on first use."""
+        if self.config.embedding_backend == EmbeddingBackend.LOCAL:
+            return self._create_local_embeddings()
+        return OpenAIEmbeddings()
+    
+    @cached_property
+    def embedding_model_id(self) -> str:
+        """Backend and model producing this manager's vectors, recorded on every collection."""
+        if self.config.embedding_backend == EmbeddingBackend.LOCAL:
+            return f"local:{self.config.local_embedding_model}"
+        return f"openai:{self._base_embeddings.model}"
+    
+    @cached_property
+    def embeddings(self):
+        """Embeddings model for the current configuration, created on first use."""
         try:
-            self.embeddings = OpenAIEmbeddings()
+            embeddings = self._base_embeddings
+            model_name = self.embedding_model_id
+            
+            if self.config.embedding_cache_path:
+                # Re-ingesting a transcript only embeds chunks not embedded before
+                embeddings = CacheBackedEmbeddings.from_bytes_store(
+                    embeddings,
+                    LocalFileStore(self.config.embedding_cache_path),
+                    namespace=model_name
+                )
             logger.debug("Embeddings initialized successfully")
+            return embeddings
         except Exception as e:
             logger.error(f"Failed to initialize embeddings: {e}")
             raise RuntimeError(f"Failed to initialize embeddings: {e}")
     
-    def _initialize_text_splitter(self) -> None:
-        """Initialize the text splitter based on configuration."""
+    def _create_local_embeddings(self):
+        """Create an in-process sentence-transformers model, on GPU when available."""
+        # Optional dependencies, only needed for the local backend
+        import torch
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        
+        return HuggingFaceEmbeddings(
+            model_name=self.config.local_embedding_model,
+            model_kwargs={"device": "cuda" if torch.cuda.is_available() else "cpu"},
+            encode_kwargs={"batch_size": 128, "normalize_embeddings": True}
+        )
+    
+    @cached_property
+    def text_splitter(self) -> RecursiveCharacterTextSplitter:
+        """Text splitter for the current configuration, created on first use."""
         try:
             if self.config.chunking_strategy == ChunkingStrategy.RECURSIVE:
-                self.text_splitter = RecursiveCharacterTextSplitter(
+                text_splitter = RecursiveCharacterTextSplitter(
                     chunk_size=self.config.chunk_size,
                     chunk_overlap=self.config.chunk_overlap,
                     separators=self.config.separators
                 )
             else:
                 # Default to recursive for now, can be extended
-                self.text_splitter = RecursiveCharacterTextSplitter(
+                text_splitter = RecursiveCharacterTextSplitter(
                     chunk_size=self.config.chunk_size,
                     chunk_overlap=self.config.chunk_overlap,
                     separators=self.config.separators
                 )
             
             logger.debug("Text splitter initialized successfully")
+            return text_splitter
         except Exception as e:
             logger.error(f"Failed to initialize text splitter: {e}")
             raise RuntimeError(f"Failed to initialize text splitter: {e}")
@@ -136,7 +225,6 @@ class VectorStoreManager:
         Returns:
             ProcessingResult with processing status and metadata.
         """
-        import time
         start_time = time.time()
         
         logger.info(f"Processing transcript for video {video_id} with {len(segments)} segments")
@@ -154,9 +242,9 @@ class VectorStoreManager:
             )
         
         try:
-            # Process segments into documents
-            documents = self._create_documents_from_segments(video_id, segments)
-            if not documents:
+            # Create chunks straight from the segments
+            chunk_docs = self._create_chunks_from_segments(video_id, segments)
+            if not chunk_docs:
                 return ProcessingResult(
                     success=False,
                     message="No valid text found in segments",
@@ -167,19 +255,6 @@ class VectorStoreManager:
                     error_message="No valid text content"
                 )
             
-            # Create chunks from documents
-            chunk_docs = self._create_chunks_from_documents(video_id, documents)
-            if not chunk_docs:
-                return ProcessingResult(
-                    success=False,
-                    message="Failed to create chunks from documents",
-                    video_id=video_id,
-                    segments_count=len(segments),
-                    chunks_count=0,
-                    processing_time=time.time() - start_time,
-                    error_message="Chunking failed"
-                )
-            
             # Create vector store
             vectorstore_path = self._create_vector_store(video_id, chunk_docs)
             if not vectorstore_path:
@@ -221,118 +296,297 @@ class VectorStoreManager:
                 error_message=error_msg
             )
     
-    def _create_documents_from_segments(self, video_id: int, segments: List[Dict[str, Any]]) -> List[Document]:
-        """Create documents from transcript segments."""
-        documents = []
-        
-        for segment in segments:
-            text = segment.get("text", "").strip()
-            if not text:
-                continue
-            
-            start_time = segment.get("start", 0)
-            duration = segment.get("duration", 0)
-            
-            # Create document with rich metadata
-            metadata = DocumentMetadata(
-                video_id=video_id,
-                start_time=start_time,
-                duration=duration,
-                timestamp=self._format_timestamp(start_time),
-                source="transcript"
-            )
-            
-            doc = Document(
-                page_content=text,
-                metadata=metadata.__dict__
-            )
-            documents.append(doc)
-        
-        logger.debug(f"Created {len(documents)} documents from segments")
-        return documents
-    
-    def _create_chunks_from_documents(self, video_id: int, documents: List[Document]) -> List[Document]:
-        """Create chunks from documents using the configured text splitter."""
-        if not documents:
-            return []
-        
-        # Extract text content
-        full_text_parts = [doc.page_content for doc in documents]
-        full_text = " ".join(full_text_parts)
-        
-        # Split into chunks
-        chunks = self.text_splitter.split_text(full_text)
+    def process_transcripts_batch(
+        self,
+        items: List[Tuple[int, List[Dict[str, Any]]]],
+        max_workers: Optional[int] = None
+    ) -> List[ProcessingResult]:
+        """
+        Process transcripts for several videos in parallel worker processes.
         
-        # Create chunk documents with metadata
-        chunk_docs = []
-        total_segments = len(documents)
+        Each video's store directory is independent, so workers share nothing;
+        every worker builds its own manager (and OpenAI/Chroma clients) once.
         
-        for i, chunk in enumerate(chunks):
-            # Calculate approximate timestamp for this chunk
-            chunk_start = self._calculate_chunk_timestamp(i, len(chunks), documents)
-            
-            metadata = DocumentMetadata(
-                video_id=video_id,
-                start_time=chunk_start,
-                duration=0,  # Will be calculated if needed
-                timestamp=self._format_timestamp(chunk_start),
-                source="transcript_chunk",
-                chunk_id=i,
-                approximate_start_time=chunk_start
-            )
+        Args:
+            items: (video_id, segments) pairs to process.
+            max_workers: Worker process count. If None, uses min(CPU count, 8).
             
-            chunk_doc = Document(
-                page_content=chunk,
-                metadata=metadata.__dict__
-            )
-            chunk_docs.append(chunk_doc)
-        
-        logger.debug(f"Created {len(chunk_docs)} chunks from {len(documents)} documents")
+        Returns:
+            List of ProcessingResult in the same order as items.
+        """
+        if len(items) <= 1:
+            return [self.process_transcript(video_id, segments) for video_id, segments in items]
+        
+        max_workers = min(max_workers or min(os.cpu_count() or 1, 8), len(items))
+        # Spawn rather than fork: forked children would inherit open SQLite/Chroma handles
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker_manager,
+            initargs=(self.config,)
+        ) as executor:
+            results = list(executor.map(_process_transcript_in_worker, *zip(*items)))
+        
+        # The workers rewrote these stores on disk; reopen them instead of
+        # querying through clients holding the old index state
+        self._evict_chroma_clients(
+            Path(self.config.storage_base_path) / f"video_{video_id}" for video_id, _ in items
+        )
+        self._list_cache = None
+        return results
+    
+    def _create_chunks_from_segments(self, video_id: int, segments: Iterable[Dict[str, Any]]) -> List[Document]:
+        """Create chunks from transcript segments using the configured text splitter."""
+        # Windows are streamed into the splitter, so no per-segment documents are
+        # materialized; oversized windows are split further and the splitter
+        # copies window metadata
+        chunk_docs = self.text_splitter.split_documents(self._iter_windows(video_id, segments))
+        for i, chunk_doc in enumerate(chunk_docs):
+            chunk_doc.metadata["chunk_id"] = i
+        
+        logger.debug(f"Created {len(chunk_docs)} chunks from transcript segments")
         return chunk_docs
     
-    def _calculate_chunk_timestamp(self, chunk_index: int, total_chunks: int, documents: List[Document]) -> float:
-        """Calculate approximate timestamp for a chunk."""
-        if not documents:
-            return 0.0
+    def _iter_windows(self, video_id: int, segments: Iterable[Dict[str, Any]]) -> Iterator[Document]:
+        """
+        Pack consecutive non-empty segments into windows of up to chunk_size characters.
         
-        # Simple linear interpolation based on chunk position
-        total_duration = documents[-1].metadata.get("start_time", 0) + documents[-1].metadata.get("duration", 0)
-        return (chunk_index / total_chunks) * total_duration
+        Each window starts with the trailing segments (up to chunk_overlap
+        characters) of the previous one, so text crossing a window boundary is
+        retrievable whole. Every window keeps the real start time of the
+        segment it begins with, carried-over segments included.
+        """
+        # (start time, text) of the segments in the current window
+        window: List[Tuple[float, str]] = []
+        window_size = 0
+        carried = 0  # Leading segments repeated from the previous window
+        for segment in segments:
+            if not (text := segment.get("text", "").strip()):
+                continue
+            text_size = len(text) + 1
+            if window and window_size + text_size > self.config.chunk_size:
+                if len(window) > carried:
+                    yield self._create_window_document(video_id, window)
+                    window = self._overlap_tail(window)
+                else:
+                    window = []
+                window_size = sum(len(text) + 1 for _, text in window)
+                # Drop the overlap when it leaves no room for the next segment
+                if window_size + text_size > self.config.chunk_size:
+                    window, window_size = [], 0
+                carried = len(window)
+            window.append((segment.get("start", 0), text))
+            window_size += text_size
+        if len(window) > carried:
+            yield self._create_window_document(video_id, window)
     
-    def _format_timestamp(self, seconds: float) -> str:
-        """Format seconds into MM:SS timestamp."""
-        minutes = int(seconds // 60)
-        seconds_remainder = int(seconds % 60)
-        return f"{minutes:02d}:{seconds_remainder:02d}"
+    def _overlap_tail(self, window: List[Tuple[float, str]]) -> List[Tuple[float, str]]:
+        """Trailing segments of a window that fit in chunk_overlap characters, never the whole window."""
+        tail_size = 0
+        tail_start = len(window)
+        while tail_start > 1:
+            tail_size += len(window[tail_start - 1][1]) + 1
+            if tail_size > self.config.chunk_overlap:
+                break
+            tail_start -= 1
+        return window[tail_start:]
+    
+    def _create_window_document(self, video_id: int, window: List[Tuple[float, str]]) -> Document:
+        """
+        Merge consecutive segments into one document starting at the first segment.
+        
+        Stored chunk metadata is kept minimal: the timestamp string is derived
+        from start_time when sources are formatted, and chunk_id is added later.
+        """
+        return Document(
+            page_content=" ".join(text for _, text in window),
+            metadata={
+                "video_id": video_id,
+                "start_time": window[0][0],
+                "source": "transcript_chunk"
+            }
+        )
     
     def _create_vector_store(self, video_id: int, documents: List[Document]) -> Optional[str]:
         """Create or update vector store for a video."""
         chroma_dir = Path(self.config.storage_base_path) / f"video_{video_id}"
+        self._list_cache = None
         
         try:
-            # Ensure directory exists
             chroma_dir.mkdir(parents=True, exist_ok=True)
             
-            # Clear existing directory to avoid conflicts
-            if chroma_dir.exists():
-                shutil.rmtree(chroma_dir)
-                chroma_dir.mkdir(parents=True, exist_ok=True)
+            texts = [doc.page_content for doc in documents]
+            metadatas = [doc.metadata for doc in documents]
+            ids = self._chunk_ids(video_id, texts, metadatas)
             
-            # Create vector store
-            vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                persist_directory=str(chroma_dir),
-                collection_name=self.config.collection_name
-            )
+            try:
+                # Keep rows whose content is unchanged; embed and insert only the rest
+                added = self._sync_collection(self._open_collection(chroma_dir), ids, texts, metadatas)
+            except Exception as e:
+                # Incompatible leftovers (e.g. another embedding backend): rebuild from scratch
+                logger.warning(f"Rebuilding vector store for video {video_id}: {e}")
+                try:
+                    self._chroma_client(chroma_dir).delete_collection(self.config.collection_name)
+                except ValueError:
+                    pass  # Collection did not exist
+                added = self._sync_collection(self._open_collection(chroma_dir), ids, texts, metadatas)
             
-            logger.info(f"Created vector store with {len(documents)} documents at {chroma_dir}")
+            logger.info(
+                f"Created vector store with {len(documents)} documents "
+                f"({added} newly embedded) at {chroma_dir}"
+            )
             return str(chroma_dir)
             
         except Exception as e:
             logger.error(f"Failed to create vector store: {e}")
             return None
     
+    def _chroma_client(self, chroma_dir: Path):
+        """Get the persistent Chroma client for a store directory, creating it once."""
+        key = str(chroma_dir)
+        with self._chroma_clients_lock:
+            client = self._chroma_clients.get(key)
+            if client is None:
+                client = chromadb.PersistentClient(path=key, settings=Settings(anonymized_telemetry=False))
+                self._chroma_clients[key] = client
+            return client
+    
+    def _evict_chroma_clients(self, chroma_dirs: Iterable[Path]) -> None:
+        """Forget cached Chroma clients so the next use reloads the stores from disk."""
+        with self._chroma_clients_lock:
+            for chroma_dir in chroma_dirs:
+                self._chroma_clients.pop(str(chroma_dir), None)
+        # chromadb also shares one system per path across clients; clearing that
+        # cache makes new clients load fresh state (existing clients keep theirs)
+        try:
+            chromadb.api.client.SharedSystemClient.clear_system_cache()
+        except AttributeError:
+            pass
+    
+    def _open_vector_store(self, chroma_dir: Path) -> Chroma:
+        """Open the vector store persisted in a store directory on its cached client."""
+        return Chroma(
+            client=self._chroma_client(chroma_dir),
+            embedding_function=self.embeddings,
+            collection_name=self.config.collection_name
+        )
+    
+    def _open_collection(self, chroma_dir: Path):
+        """
+        Open the Chroma collection in a store directory, creating it with tuned HNSW parameters.
+        
+        A collection embedded by another backend or model is deleted and
+        recreated: its chunk IDs would all match, so nothing would be
+        re-embedded and queries would search a different vector space.
+        """
+        client = self._chroma_client(chroma_dir)
+        try:
+            collection = client.get_collection(self.config.collection_name, embedding_function=None)
+            stored_model = (collection.metadata or {}).get("embedding_model")
+            if stored_model == self.embedding_model_id:
+                return collection
+            logger.warning(
+                f"Rebuilding vector store at {chroma_dir}: embedded with {stored_model}, "
+                f"now using {self.embedding_model_id}"
+            )
+            client.delete_collection(self.config.collection_name)
+        except ValueError:
+            pass  # Collection does not exist yet
+        
+        # HNSW parameters are fixed when the index is built, so only new collections get them
+        return client.create_collection(
+            self.config.collection_name,
+            metadata={
+                "hnsw:M": self.config.hnsw_m,
+                "hnsw:construction_ef": self.config.hnsw_construction_ef,
+                "hnsw:search_ef": self.config.hnsw_search_ef,
+                "embedding_model": self.embedding_model_id
+            },
+            embedding_function=None
+        )
+    
+    @staticmethod
+    def _chunk_ids(video_id: int, texts: List[str], metadatas: List[Dict[str, Any]]) -> List[str]:
+        """
+        Deterministic chunk IDs derived from each chunk's text and start time.
+        
+        Positions (and the positional chunk_id) are left out, so inserting or
+        removing a segment only changes the IDs of the chunks it touches.
+        Repeated (text, start time) pairs are told apart by an occurrence count.
+        """
+        occurrences: Counter = Counter()
+        ids = []
+        for text, metadata in zip(texts, metadatas):
+            content = f"{video_id}|{metadata.get('start_time', 0)}|{text}"
+            ids.append(hashlib.sha1(f"{content}|{occurrences[content]}".encode("utf-8")).hexdigest()[:24])
+            occurrences[content] += 1
+        return ids
+    
+    def _sync_collection(self, collection, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]) -> int:
+        """
+        Make a collection hold exactly the given chunks, embedding only chunks it lacks.
+        
+        Chunks it already has keep their embeddings; only their metadata is
+        refreshed, since chunk_id is positional.
+        
+        Args:
+            collection: Chroma collection to update.
+            ids: Deterministic chunk IDs.
+            texts: Chunk texts, aligned with ids.
+            metadatas: Chunk metadata, aligned with ids.
+            
+        Returns:
+            Number of chunks that were embedded and inserted.
+        """
+        existing = set(collection.get(include=[])["ids"])
+        wanted = set(ids)
+        
+        stale = [chunk_id for chunk_id in existing if chunk_id not in wanted]
+        if stale:
+            collection.delete(ids=stale)
+        
+        kept = [i for i, chunk_id in enumerate(ids) if chunk_id in existing]
+        if kept:
+            collection.update(ids=[ids[i] for i in kept], metadatas=[metadatas[i] for i in kept])
+        
+        new = [i for i, chunk_id in enumerate(ids) if chunk_id not in existing]
+        if new:
+            # Embed chunks with concurrent requests, then upsert them in one call
+            new_texts = [texts[i] for i in new]
+            collection.upsert(
+                ids=[ids[i] for i in new],
+                embeddings=self._embed_texts(new_texts),
+                metadatas=[metadatas[i] for i in new],
+                documents=new_texts
+            )
+        return len(new)
+    
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts in fixed-size batches sent concurrently.
+        
+        Args:
+            texts: Texts to embed.
+            
+        Returns:
+            Embedding vectors in the same order as texts.
+        """
+        batch_size = self.config.embedding_batch_size
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        if len(batches) <= 1:
+            return self.embeddings.embed_documents(texts)
+        
+        # Each batch is one network round trip, so overlap them in threads
+        max_workers = min(self.config.max_concurrent_batches, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._embed_batch, batches))
+        return [vector for batch in results for vector in batch]
+    
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch after a short random delay so concurrent requests don't arrive in a burst."""
+        time.sleep(random.uniform(0, 0.05))
+        return self.embeddings.embed_documents(texts)
+    
     def load_vector_store(self, video_id: int) -> Optional[Chroma]:
         """
         Load existing vector store for a video.
@@ -350,12 +604,11 @@ class VectorStoreManager:
             return None
         
         try:
+            # Start kernel readahead on the store files before Chroma opens them
+            self._prefetch_store_files(chroma_dir)
+            
             # Load existing vector store
-            vectorstore = Chroma(
-                persist_directory=str(chroma_dir),
-                embedding_function=self.embeddings,
-                collection_name=self.config.collection_name
-            )
+            vectorstore = self._open_vector_store(chroma_dir)
             
             logger.info(f"Successfully loaded vector store for video {video_id}")
             return vectorstore
@@ -375,7 +628,53 @@ class VectorStoreManager:
             True if vector store exists and is not empty, False otherwise.
         """
         chroma_dir = Path(self.config.storage_base_path) / f"video_{video_id}"
-        return chroma_dir.exists() and any(chroma_dir.iterdir())
+        try:
+            with os.scandir(chroma_dir) as entries:
+                return next(entries, None) is not None
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+    
+    def check_vector_stores_exist(self, video_ids: Iterable[int]) -> Dict[int, bool]:
+        """
+        Check which of many videos have a vector store.
+        
+        The directory checks run concurrently so a cold inode cache costs one
+        round of disk latency instead of one per video.
+        
+        Args:
+            video_ids: The IDs of the videos to check.
+            
+        Returns:
+            Dictionary mapping each video ID to whether its vector store exists.
+        """
+        video_ids = list(video_ids)
+        if len(video_ids) <= 1:
+            return {video_id: self.check_vector_store_exists(video_id) for video_id in video_ids}
+        
+        with ThreadPoolExecutor(max_workers=min(self.EXISTS_CHECK_WORKERS, len(video_ids))) as executor:
+            return dict(zip(video_ids, executor.map(self.check_vector_store_exists, video_ids)))
+    
+    @staticmethod
+    def _prefetch_store_files(chroma_dir: Path) -> None:
+        """Ask the kernel to read a store's files into the page cache asynchronously."""
+        if not hasattr(os, "posix_fadvise"):
+            return
+        
+        pending = [str(chroma_dir)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                            continue
+                        fd = os.open(entry.path, os.O_RDONLY)
+                        try:
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                        finally:
+                            os.close(fd)
+            except OSError as e:
+                logger.debug(f"Skipping readahead for {chroma_dir}: {e}")
     
     def get_vector_store_info(self, video_id: int) -> Dict[str, Any]:
         """
@@ -399,8 +698,7 @@ class VectorStoreManager:
         
         try:
             # Get directory size and file list
-            total_size = sum(f.stat().st_size for f in chroma_dir.rglob('*') if f.is_file())
-            files = [f.name for f in chroma_dir.iterdir() if f.is_file()]
+            total_size, files = self._scan_store_dir(chroma_dir)
             
             return {
                 "exists": True,
@@ -418,6 +716,24 @@ class VectorStoreManager:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _scan_store_dir(chroma_dir: Path) -> Tuple[int, List[str]]:
+        """Total size of all files under a store, and the names of its top-level files, in one pass."""
+        total_size = 0
+        files = []
+        pending = [(str(chroma_dir), True)]
+        while pending:
+            path, top_level = pending.pop()
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, False))
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                        if top_level:
+                            files.append(entry.name)
+        return total_size, files
+    
     def delete_vector_store(self, video_id: int) -> bool:
         """
         Delete vector store for a video.
@@ -435,7 +751,9 @@ class VectorStoreManager:
             return True
         
         try:
+            self._evict_chroma_clients([chroma_dir])
             shutil.rmtree(chroma_dir)
+            self._list_cache = None
             logger.info(f"Successfully deleted vector store for video {video_id}")
             return True
             
@@ -452,6 +770,11 @@ class VectorStoreManager:
         """
         storage_path = Path(self.config.storage_base_path)
         
+        cached = self._list_cache
+        if (cached and cached[1] == self.config.storage_base_path
+                and time.monotonic() - cached[0] < self.LIST_CACHE_TTL):
+            return [dict(info) for info in cached[2]]
+        
         if not storage_path.exists():
             return []
         
@@ -467,7 +790,8 @@ class VectorStoreManager:
                 except (ValueError, IndexError):
                     continue
         
-        return vector_stores
+        self._list_cache = (time.monotonic(), self.config.storage_base_path, vector_stores)
+        return [dict(info) for info in vector_stores]
     
     def update_config(self, new_config: VectorStoreConfig) -> None:
         """
@@ -477,8 +801,12 @@ class VectorStoreManager:
             new_config: New configuration object.
         """
         self.config = new_config
-        self._initialize_embeddings()
-        self._initialize_text_splitter()
+        self._list_cache = None
+        with self._chroma_clients_lock:
+            self._chroma_clients.clear()
+        # Recreated from the new configuration on next use
+        for name in ("_base_embeddings", "embedding_model_id", "embeddings", "text_splitter"):
+            self.__dict__.pop(name, None)
         logger.info("VectorStoreManager configuration updated")
     
     def validate_segments(self, segments: List[Dict[str, Any]]) -> Tuple[bool, List[str]]:
@@ -533,4 +861,38 @@ class VectorStoreManager:
             "segments_count": result.segments_count,
             "chunks_count": result.chunks_count,
             "vectorstore_path": result.vectorstore_path
-        } 
\ No newline at end of file
+        }
+
+
+# Manager owned by a process_transcripts_batch worker process
+_WORKER_MANAGER: Optional[VectorStoreManager] = None
+
+
+def _init_worker_manager(config: VectorStoreConfig) -> None:
+    """Create the worker process's manager with the parent's configuration."""
+    global _WORKER_MANAGER
+    _WORKER_MANAGER = VectorStoreManager(config)
+
+
+def _process_transcript_in_worker(video_id: int, segments: List[Dict[str, Any]]) -> ProcessingResult:
+    """Process one transcript with the worker process's manager."""
+    return _WORKER_MANAGER.process_transcript(video_id, segments)
+
+
+# Process-wide default manager shared by services that do not need a custom config
+_SHARED_MANAGER: Optional[VectorStoreManager] = None
+_SHARED_MANAGER_LOCK = threading.Lock()
+
+
+def get_shared_vector_store_manager() -> VectorStoreManager:
+    """
+    Get the process-wide VectorStoreManager with the default configuration.
+    
+    Returns:
+        The shared VectorStoreManager, created on first use.
+    """
+    global _SHARED_MANAGER
+    with _SHARED_MANAGER_LOCK:
+        if _SHARED_MANAGER is None:
+            _SHARED_MANAGER = VectorStoreManager()
+        return _SHARED_MANAGER
@@ -20,18 +20,158 @@ Architecture:
 Refactored from monolithic service (667 lines) → Modular architecture (6 focused modules)
 """
 
+import os
+import re
+import time
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Union
 from sqlalchemy.orm import Session
 
 from .transcript.transcript_extractor import TranscriptExtractor
-from .langchain.vector_store_manager import VectorStoreManager
-from .langchain.qa_manager import QAManager
-from .langchain.section_generator import SectionGenerator
+from .langchain.vector_store_manager import (
+    EmbeddingBackend, ProcessingResult, VectorStoreManager, get_shared_vector_store_manager
+)
+from .langchain.qa_manager import QAManager, QAResponse
+from .langchain.section_generator import SectionGenerationResult, SectionGenerator
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Transcript extractions in flight at once during batch processing
+TRANSCRIPT_CONCURRENCY = int(os.getenv("TRANSCRIPT_CONCURRENCY", "8"))
+
+# Seconds a confirmed vector store is trusted before the filesystem is probed again
+PROCESSED_CACHE_TTL = 60.0
+
+# video_id -> monotonic time its vector store was last confirmed. Module-level
+# because routes build a new service per request.
+_processed_cache: Dict[int, float] = {}
+_processed_cache_lock = threading.Lock()
+
+
+# Messages that are only a greeting or thanks; answering them needs no transcript
+_SMALL_TALK_PATTERN = re.compile(
+    r"^(hi|hello|hey|thanks|thank you|thx|ok|okay|cool|great)( there| so much| a lot)?[\s!.,:)]*$",
+    re.IGNORECASE
+)
+SMALL_TALK_ANSWER = "Hi! Ask me anything about this video and I'll answer from its transcript."
+
+# How many questions were answered with and without retrieval
+_route_counts: Counter = Counter()
+_route_counts_lock = threading.Lock()
+
+
+def _mark_processed(video_id: int) -> None:
+    with _processed_cache_lock:
+        _processed_cache[video_id] = time.monotonic()
+
+
+def _is_known_processed(video_id: int) -> bool:
+    with _processed_cache_lock:
+        confirmed_at = _processed_cache.get(video_id)
+    return confirmed_at is not None and time.monotonic() - confirmed_at < PROCESSED_CACHE_TTL
+
+
+class LangChainEngine:
+    """
+    Heavy components behind LangChainVideoService, shared across requests.
+    
+    Components are created on first use, so a process only pays for the ones
+    its requests touch, and LLM clients, prompt templates and connection pools
+    are built once rather than per request.
+    """
+    
+    @cached_property
+    def transcript_extractor(self) -> TranscriptExtractor:
+        """Transcript extractor, created on first use."""
+        try:
+            return TranscriptExtractor()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize transcript extractor: {e}")
+            raise RuntimeError(f"Failed to initialize transcript extractor: {e}")
+    
+    @cached_property
+    def vector_store_manager(self) -> VectorStoreManager:
+        """Process-wide vector store manager."""
+        try:
+            return get_shared_vector_store_manager()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize vector store manager: {e}")
+            raise RuntimeError(f"Failed to initialize vector store manager: {e}")
+    
+    @cached_property
+    def qa_manager(self) -> QAManager:
+        """Q&A manager, created on first use."""
+        try:
+            return QAManager()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize Q&A manager: {e}")
+            raise RuntimeError(f"Failed to initialize Q&A manager: {e}")
+    
+    @cached_property
+    def section_generator(self) -> SectionGenerator:
+        """Section generator, created on first use."""
+        try:
+            return SectionGenerator()
+        except Exception as e:
+            logger.error(f"❌ Failed to initialize section generator: {e}")
+            raise RuntimeError(f"Failed to initialize section generator: {e}")
+    
+    def warmup(self, video_ids: List[int]) -> None:
+        """
+        Pay cold-start costs before the first request does.
+        
+        Builds every component and its language model client, loads a local
+        embedding model by embedding a dummy query, and pre-builds QA chains for
+        the given videos. No billed API call is made.
+        
+        Args:
+            video_ids: IDs of the videos whose QA chains to build.
+        """
+        start_time = time.perf_counter()
+        
+        # Touching the lazy components creates them
+        self.transcript_extractor
+        vector_store_manager = self.vector_store_manager
+        try:
+            embeddings = vector_store_manager.embeddings
+            # Loading local model weights is the slow part; API embeddings would only cost money
+            if vector_store_manager.config.embedding_backend == EmbeddingBackend.LOCAL:
+                embeddings.embed_query("warmup")
+        except Exception as e:
+            logger.warning(f"Embedding warmup failed: {e}")
+        
+        # Creating the clients does not call the API
+        self.qa_manager.llm
+        self.section_generator.qa_manager.llm
+        self.qa_manager.warmup(video_ids)
+        
+        logger.info(f"LangChain engine warmed up in {time.perf_counter() - start_time:.2f}s")
+
+
+_ENGINE: Optional[LangChainEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_langchain_engine() -> LangChainEngine:
+    """
+    Get the process-wide LangChainEngine.
+    
+    Returns:
+        The shared LangChainEngine, created on first use.
+    """
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            _ENGINE = LangChainEngine()
+            logger.info("✅ LangChain engine initialized with modular architecture")
+        return _ENGINE
+
 
 class LangChainVideoService:
     """
@@ -48,28 +188,37 @@ class LangChainVideoService:
     - Vector embeddings with ChromaDB
     - RAG-based question answering
     - AI-powered video sectioning
+    
+    The components live on a shared LangChainEngine; only the database session
+    is per request, so constructing the service is cheap.
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, engine: Optional[LangChainEngine] = None):
         """
         Initialize the service with database session.
         
         Args:
             db: SQLAlchemy database session
+            engine: Components to use. If None, uses the process-wide engine.
         """
         self.db = db
-        
-        # Initialize modular components
-        try:
-            self.transcript_extractor = TranscriptExtractor()
-            self.vector_store_manager = VectorStoreManager()
-            self.qa_manager = QAManager()
-            self.section_generator = SectionGenerator()
-            
-            logger.info("✅ LangChain Video Service initialized with modular architecture")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize LangChain Video Service: {e}")
-            raise RuntimeError(f"Failed to initialize LangChain Video Service: {e}")
+        self.engine = engine or get_langchain_engine()
+    
+    @property
+    def transcript_extractor(self) -> TranscriptExtractor:
+        return self.engine.transcript_extractor
+    
+    @property
+    def vector_store_manager(self) -> VectorStoreManager:
+        return self.engine.vector_store_manager
+    
+    @property
+    def qa_manager(self) -> QAManager:
+        return self.engine.qa_manager
+    
+    @property
+    def section_generator(self) -> SectionGenerator:
+        return self.engine.section_generator
     
     def extract_video_id(self, url: str) -> str:
         """
@@ -84,11 +233,7 @@ class LangChainVideoService:
         Raises:
             ValueError: If video ID cannot be extracted
         """
-        try:
-            return self.transcript_extractor.extract_video_id(url)
-        except Exception as e:
-            logger.error(f"Failed to extract video ID from URL {url}: {e}")
-            raise
+        return self.transcript_extractor.extract_video_id(url)
     
     def fetch_transcript(self, video_url: str) -> List[Dict[str, Any]]:
         """
@@ -101,16 +246,39 @@ class LangChainVideoService:
             List of transcript segments
             
         Raises:
-            RuntimeError: If transcript extraction fails
+            ValueError: If the URL has no video ID
         """
-        try:
-            logger.info(f"Fetching transcript for video: {video_url}")
-            return self.transcript_extractor.fetch_transcript(video_url)
-        except Exception as e:
-            logger.error(f"Failed to fetch transcript for {video_url}: {e}")
-            raise RuntimeError(f"Failed to fetch transcript: {e}")
+        logger.info(f"Fetching transcript for video: {video_url}")
+        return self.transcript_extractor.fetch_transcript(video_url)
     
-    def process_transcript(self, video_id: int, video_url: str) -> Dict[str, Any]:
+    async def fetch_transcripts_batch(
+        self,
+        video_urls: List[str]
+    ) -> List[Union[List[Dict[str, Any]], Exception]]:
+        """
+        Fetch transcripts for several videos concurrently.
+        
+        Extraction is blocking network I/O, so each one runs in a worker thread;
+        at most TRANSCRIPT_CONCURRENCY run at once.
+        
+        Args:
+            video_urls: YouTube video URLs
+            
+        Returns:
+            Transcript segments per URL, in order; a failed URL yields its exception
+        """
+        semaphore = asyncio.Semaphore(TRANSCRIPT_CONCURRENCY)
+        
+        async def fetch_one(video_url: str) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch_transcript, video_url)
+        
+        return list(await asyncio.gather(
+            *(fetch_one(video_url) for video_url in video_urls),
+            return_exceptions=True
+        ))
+    
+    def process_transcript(self, video_id: int, video_url: str) -> ProcessingResult:
         """
         Process transcript and create vector store.
         
@@ -119,28 +287,85 @@ class LangChainVideoService:
             video_url: YouTube video URL
             
         Returns:
-            Processing result dictionary
+            Processing result
+        """
+        logger.info(f"Processing transcript for video {video_id}")
+        
+        # Forget any earlier confirmation until the new store is written
+        self.invalidate_processed(video_id)
+        
+        # 1. Fetch transcript using the transcript extractor
+        segments = self.transcript_extractor.fetch_transcript(video_url)
+        
+        # 2. Process transcript and create vector store
+        result = self.vector_store_manager.process_transcript(video_id, segments)
+        
+        # Chains and answers cached against the previous transcript are stale now
+        self.qa_manager.clear_cache(video_id)
+        if result.success:
+            _mark_processed(video_id)
+        
+        logger.info(f"Processed transcript for video {video_id}: {result.message}")
+        return result
+    
+    def process_transcripts_batch(self, videos: List[Tuple[int, str]]) -> List[ProcessingResult]:
+        """
+        Fetch and process transcripts for several videos.
+        
+        Transcripts are fetched concurrently, then ingested in parallel worker
+        processes. Safe to call with or without a running event loop; when one
+        is running (e.g. from an async route) the fetches run on a fresh loop in
+        a worker thread, and this call blocks until they finish.
+        
+        Args:
+            videos: (database video ID, YouTube video URL) pairs
             
-        Raises:
-            RuntimeError: If processing fails
+        Returns:
+            Processing results in the same order as videos
         """
+        logger.info(f"Processing transcripts for {len(videos)} videos")
+        
+        def fetch() -> List[Union[List[Dict[str, Any]], Exception]]:
+            return asyncio.run(self.fetch_transcripts_batch([video_url for _, video_url in videos]))
+        
         try:
-            logger.info(f"Processing transcript for video {video_id}")
-            
-            # 1. Fetch transcript using the transcript extractor
-            segments = self.transcript_extractor.fetch_transcript(video_url)
-            
-            # 2. Process transcript and create vector store
-            result = self.vector_store_manager.process_transcript(video_id, segments)
-            
-            logger.info(f"Successfully processed transcript for video {video_id}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Failed to process transcript for video {video_id}: {e}")
-            raise RuntimeError(f"Failed to process transcript: {e}")
+            asyncio.get_running_loop()
+        except RuntimeError:
+            transcripts = fetch()
+        else:
+            # asyncio.run cannot start inside a running loop
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                transcripts = executor.submit(fetch).result()
+        
+        results: List[Optional[ProcessingResult]] = [None] * len(videos)
+        fetched = []
+        for index, ((video_id, _), segments) in enumerate(zip(videos, transcripts)):
+            self.invalidate_processed(video_id)
+            if isinstance(segments, Exception):
+                results[index] = ProcessingResult(
+                    success=False,
+                    message="Failed to fetch transcript",
+                    video_id=video_id,
+                    segments_count=0,
+                    chunks_count=0,
+                    error_message=str(segments)
+                )
+            else:
+                fetched.append((index, video_id, segments))
+        
+        processed = self.vector_store_manager.process_transcripts_batch(
+            [(video_id, segments) for _, video_id, segments in fetched]
+        )
+        for (index, video_id, _), result in zip(fetched, processed):
+            # Chains and answers cached against the previous transcript are stale now
+            self.qa_manager.clear_cache(video_id)
+            if result.success:
+                _mark_processed(video_id)
+            results[index] = result
+        
+        return results
     
-    def ask_question(self, video_id: int, question: str) -> Dict[str, Any]:
+    def ask_question(self, video_id: int, question: str) -> QAResponse:
         """
         Ask a question about a video.
         
@@ -149,19 +374,61 @@ class LangChainVideoService:
             question: Question to ask about the video
             
         Returns:
-            Q&A response dictionary
+            Q&A response
+        """
+        if not self._should_retrieve(question):
+            return QAResponse(success=True, answer=SMALL_TALK_ANSWER, sources=[], processing_time=0.0)
+        
+        logger.info(f"Processing question for video {video_id}: {question[:50]}...")
+        return self.qa_manager.ask_question(video_id, question)
+    
+    def ask_question_stream(self, video_id: int, question: str) -> Iterator[str]:
+        """
+        Ask a question about a video, streaming the answer.
+        
+        Args:
+            video_id: Database video ID
+            question: Question to ask about the video
             
-        Raises:
-            RuntimeError: If question answering fails
+        Returns:
+            Iterator over pieces of the answer text
         """
-        try:
-            logger.info(f"Processing question for video {video_id}: {question[:50]}...")
-            return self.qa_manager.ask_question(video_id, question)
-        except Exception as e:
-            logger.error(f"Failed to answer question for video {video_id}: {e}")
-            raise RuntimeError(f"Failed to answer question: {e}")
+        if not self._should_retrieve(question):
+            return iter([SMALL_TALK_ANSWER])
+        
+        logger.info(f"Streaming question for video {video_id}: {question[:50]}...")
+        return self.qa_manager.ask_question_stream(video_id, question)
     
-    def generate_sections(self, video_id: int) -> List[Dict[str, Any]]:
+    def _should_retrieve(self, question: str) -> bool:
+        """
+        Decide whether a question needs transcript retrieval and the LLM.
+        
+        Greetings and thanks get a canned reply instead of paying for an
+        embedding, a vector search and a completion.
+        
+        Args:
+            question: Question as sent by the user
+            
+        Returns:
+            False if the question is small talk, True otherwise
+        """
+        retrieve = _SMALL_TALK_PATTERN.match(question.strip()) is None
+        with _route_counts_lock:
+            _route_counts["retrieval" if retrieve else "small_talk"] += 1
+        return retrieve
+    
+    @staticmethod
+    def get_route_counts() -> Dict[str, int]:
+        """
+        Get how many questions were answered with and without retrieval.
+        
+        Returns:
+            Dictionary mapping each route ("retrieval", "small_talk") to its question count
+        """
+        with _route_counts_lock:
+            return dict(_route_counts)
+    
+    def generate_sections(self, video_id: int) -> SectionGenerationResult:
         """
         Generate intelligent sections using LangChain.
         
@@ -169,17 +436,10 @@ class LangChainVideoService:
             video_id: Database video ID
             
         Returns:
-            List of generated sections
-            
-        Raises:
-            RuntimeError: If section generation fails
+            Section generation result
         """
-        try:
-            logger.info(f"Generating sections for video {video_id}")
-            return self.section_generator.generate_sections(video_id)
-        except Exception as e:
-            logger.error(f"Failed to generate sections for video {video_id}: {e}")
-            raise RuntimeError(f"Failed to generate sections: {e}")
+        logger.info(f"Generating sections for video {video_id}")
+        return self.section_generator.generate_sections(video_id)
     
     def get_qa_chain(self, video_id: int):
         """
@@ -189,16 +449,9 @@ class LangChainVideoService:
             video_id: Database video ID
             
         Returns:
-            QA chain object
-            
-        Raises:
-            RuntimeError: If QA chain creation fails
+            QA chain object, or None if the video has no vector store
         """
-        try:
-            return self.qa_manager.get_qa_chain(video_id)
-        except Exception as e:
-            logger.error(f"Failed to get QA chain for video {video_id}: {e}")
-            raise RuntimeError(f"Failed to get QA chain: {e}")
+        return self.qa_manager.get_qa_chain(video_id)
     
     def check_video_processed(self, video_id: int) -> bool:
         """
@@ -210,9 +463,43 @@ class LangChainVideoService:
         Returns:
             True if video is processed, False otherwise
         """
+        if _is_known_processed(video_id):
+            return True
+        
         try:
-            return self.vector_store_manager.check_vector_store_exists(video_id)
+            processed = self.vector_store_manager.check_vector_store_exists(video_id)
         except Exception as e:
             logger.error(f"Failed to check processing status for video {video_id}: {e}")
+            self.invalidate_processed(video_id)
             return False
+        
+        if processed:
+            _mark_processed(video_id)
+        return processed
+    
+    def check_videos_processed(self, video_ids: List[int]) -> Dict[int, bool]:
+        """
+        Check which of many videos have been processed.
+        
+        Args:
+            video_ids: Database video IDs
+            
+        Returns:
+            Dictionary mapping each video ID to whether it is processed
+        """
+        try:
+            return self.vector_store_manager.check_vector_stores_exist(video_ids)
+        except Exception as e:
+            logger.error(f"Failed to check processing status for videos {video_ids}: {e}")
+            return {video_id: False for video_id in video_ids}
+    
+    def invalidate_processed(self, video_id: int) -> None:
+        """
+        Forget a cached processing status so the next check probes the store.
+        
+        Args:
+            video_id: Database video ID
+        """
+        with _processed_cache_lock:
+            _processed_cache.pop(video_id, None)
     
\ No newline at end of file
@@ -3,86 +3,372 @@ Simple embedding service using CLIP for visual embeddings.
 Stores embeddings locally without Qdrant dependency.
 """
 
+import io
 import os
+import asyncio
+import functools
+import hashlib
 import numpy as np
 import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import open_clip
 import torch
+import torch.nn.functional as F
 from sqlalchemy.orm import Session
 from ..models.frame import Frame
 from ..models.video import Video
 
+# Process-wide cache of CLIP text embeddings for search queries
+_TEXT_EMBEDDING_CACHE: "OrderedDict[tuple, torch.Tensor]" = OrderedDict()
+_TEXT_EMBEDDING_CACHE_SIZE = 1024
+_TEXT_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+# Serializes the first CLIP load so concurrent requests do not load it twice
+_CLIP_LOAD_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _create_clip(device: str, quantize: bool):
+    """Load CLIP once per process; every service instance shares the result."""
+    print("Loading CLIP model...")
+    model, _, preprocess = open_clip.create_model_and_transforms(
+        'ViT-B-32', 
+        pretrained='openai'
+    )
+    tokenizer = open_clip.get_tokenizer('ViT-B-32')
+    model.to(device)
+    model.eval()
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        print("CLIP model quantized to int8 for CPU inference")
+    print("CLIP model loaded successfully")
+    return model, preprocess, tokenizer
+
+
+def _get_clip(device: str, quantize: bool):
+    """Return the shared (model, preprocess, tokenizer) triple, loading it on first use."""
+    with _CLIP_LOAD_LOCK:
+        return _create_clip(device, quantize)
+
+
+# CUDA graph replay reuses static buffers, so only one batch may run through it at a time
+_CUDA_GRAPH_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _capture_image_graph(model, batch_size: int):
+    """
+    Capture CLIP's image encoder as a CUDA graph for a fixed batch shape.
+    
+    Returns (graph, static_input, static_output); callers copy a batch into
+    static_input, replay the graph and read static_output.
+    """
+    autocast = functools.partial(
+        torch.autocast, device_type="cuda", dtype=torch.float16, cache_enabled=False
+    )
+    with torch.inference_mode():
+        # ViT-B-32 takes 224x224 RGB inputs
+        static_input = torch.zeros((batch_size, 3, 224, 224), device="cuda")
+        
+        # Warm up on a side stream so lazy initialization is not captured
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), autocast():
+            for _ in range(3):
+                model.encode_image(static_input)
+        torch.cuda.current_stream().wait_stream(stream)
+        
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), autocast():
+            static_output = model.encode_image(static_input)
+    return graph, static_input, static_output
+
+
+def _embedding_vector(record: dict) -> np.ndarray:
+    """Return a stored record's embedding as float32, dequantizing int8 storage."""
+    embedding = record['embedding']
+    scale = record.get('scale')
+    if scale is None:
+        return embedding.astype(np.float32, copy=False)
+    return embedding.astype(np.float32) * scale
+
+
+def _dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """64-bit difference hash comparing adjacent pixels of a small grayscale thumbnail."""
+    thumbnail = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = list(thumbnail.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
 class SimpleEmbeddingService:
     """Simple embedding service using CLIP without external vector databases."""
     
+    # Number of frames encoded per CLIP forward pass
+    BATCH_SIZE = 64
+    
+    # Threads decoding and preprocessing frame images ahead of the encoder
+    DECODE_WORKERS = min(8, os.cpu_count() or 1)
+    
+    # Frames whose dHash differs from the previous kept frame by fewer bits than
+    # this are treated as near-duplicates and not embedded (0 disables the check)
+    DUPLICATE_HASH_DISTANCE = 6
+    
+    # Identifies the weights that produced an embedding; part of every cache key
+    # (suffixed with '+int8' when the quantized CPU model is in use)
+    MODEL_TAG = "ViT-B-32/openai"
+    
     def __init__(self, db: Session):
         self.db = db
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        # Optional int8 dynamic quantization of the Linear layers for CPU inference
+        self.quantize = (
+            self.device == "cpu"
+            and os.getenv("CLIP_QUANTIZE_CPU", "false").lower() == "true"
+        )
+        self.model_tag = f"{self.MODEL_TAG}+int8" if self.quantize else self.MODEL_TAG
+        # Optional int8 storage of saved embeddings with a per-vector scale
+        self.store_int8 = os.getenv("CLIP_STORE_INT8", "false").lower() == "true"
+        # Optional CUDA graph replay of the image encoder at a fixed BATCH_SIZE
+        self.use_cuda_graph = (
+            self.device == "cuda"
+            and os.getenv("CLIP_CUDA_GRAPHS", "false").lower() == "true"
+        )
         self.model = None
         self.preprocess = None
         self.tokenizer = None
         
     def _load_clip_model(self):
-        """Load CLIP model if not already loaded."""
+        """Attach the process-wide CLIP model if not already attached."""
         if self.model is None:
-            print("Loading CLIP model...")
-            self.model, _, self.preprocess = open_clip.create_model_and_transforms(
-                'ViT-B-32', 
-                pretrained='openai'
-            )
-            self.tokenizer = open_clip.get_tokenizer('ViT-B-32')
-            self.model.to(self.device)
-            self.model.eval()
-            print("CLIP model loaded successfully")
+            self.model, self.preprocess, self.tokenizer = _get_clip(self.device, self.quantize)
+    
+    def _content_hash(self, data: bytes) -> str:
+        """Hash image bytes together with the model tag for embedding reuse."""
+        return hashlib.sha256(self.model_tag.encode() + data).hexdigest()
+    
+    def _load_cached_embeddings(self, embeddings_file: Path) -> dict:
+        """Map content hashes to embedding records from a previously saved embeddings file."""
+        if not embeddings_file.exists():
+            return {}
+        try:
+            with open(embeddings_file, 'rb') as f:
+                previous = pickle.load(f)
+        except Exception as e:
+            print(f"Could not read previous embeddings: {str(e)}")
+            return {}
+        return {
+            item['content_hash']: item
+            for item in previous
+            if 'content_hash' in item
+        }
+    
+    def _encode_text(self, query: str) -> torch.Tensor:
+        """Encode a search query into a normalized CLIP text embedding, with caching."""
+        # The CLIP tokenizer lowercases and collapses whitespace, so queries that
+        # differ only in case or spacing produce identical embeddings
+        query = " ".join(query.lower().split())
+        key = (self.model_tag, query)
+        with _TEXT_EMBEDDING_CACHE_LOCK:
+            cached = _TEXT_EMBEDDING_CACHE.get(key)
+            if cached is not None:
+                _TEXT_EMBEDDING_CACHE.move_to_end(key)
+        if cached is not None:
+            return cached.to(self.device)
+        
+        text_tokens = self.tokenizer([query]).to(self.device)
+        with torch.no_grad():
+            text_embedding = self.model.encode_text(text_tokens)
+            text_embedding = text_embedding / text_embedding.norm(dim=-1, keepdim=True)
+        
+        with _TEXT_EMBEDDING_CACHE_LOCK:
+            _TEXT_EMBEDDING_CACHE[key] = text_embedding.cpu()
+            if len(_TEXT_EMBEDDING_CACHE) > _TEXT_EMBEDDING_CACHE_SIZE:
+                _TEXT_EMBEDDING_CACHE.popitem(last=False)
+        return text_embedding
+    
+    def _load_frame(self, frame: Frame, cached_embeddings: dict):
+        """
+        Read, hash and preprocess a single frame image.
+        
+        Runs in a worker thread. Returns (frame, content_hash, cached_record,
+        image_tensor, dhash) where exactly one of cached_record and image_tensor
+        is set, or None on error.
+        """
+        try:
+            with open(frame.path, 'rb') as f:
+                image_bytes = f.read()
+            content_hash = self._content_hash(image_bytes)
+            
+            cached_record = cached_embeddings.get(content_hash)
+            if cached_record is not None:
+                return frame, content_hash, cached_record, None, cached_record.get('dhash')
+            
+            image = Image.open(io.BytesIO(image_bytes)).convert('RGB')
+            return frame, content_hash, None, self.preprocess(image), _dhash(image)
+        except Exception as e:
+            print(f"Error processing frame {frame.id}: {str(e)}")
+            return None
+    
+    def _encode_images(self, image_batch: torch.Tensor) -> np.ndarray:
+        """Encode a batch of preprocessed images into L2-normalized CLIP embeddings."""
+        if self.use_cuda_graph:
+            return self._encode_images_graphed(image_batch)
+        
+        image_batch = image_batch.to(self.device, non_blocking=True)
+        with torch.inference_mode(), torch.autocast(
+            device_type=self.device, dtype=torch.float16, enabled=self.device == "cuda"
+        ):
+            features = self.model.encode_image(image_batch)
+            features = F.normalize(features.float(), dim=-1)
+        return features.cpu().numpy()
+    
+    def _encode_images_graphed(self, image_batch: torch.Tensor) -> np.ndarray:
+        """Encode a batch by replaying the captured CUDA graph, zero-padding partial batches."""
+        count = image_batch.shape[0]
+        with _CUDA_GRAPH_LOCK, torch.inference_mode():
+            graph, static_input, static_output = _capture_image_graph(self.model, self.BATCH_SIZE)
+            static_input[:count].copy_(image_batch, non_blocking=True)
+            static_input[count:].zero_()
+            graph.replay()
+            features = F.normalize(static_output[:count].float(), dim=-1)
+            return features.cpu().numpy()
+    
+    def _stored_embedding(self, embedding: np.ndarray) -> dict:
+        """Build the embedding fields of a saved record, quantizing to int8 if enabled."""
+        embedding = embedding.reshape(1, -1).astype(np.float32, copy=False)
+        if not self.store_int8:
+            return {'embedding': embedding}
+        scale = float(np.abs(embedding).max()) / 127.0 or 1.0
+        quantized = np.clip(np.rint(embedding / scale), -127, 127).astype(np.int8)
+        return {'embedding': quantized, 'scale': scale}
+    
+    def _iter_frame_batches(self, frames):
+        """Group streamed frame rows whose image file exists into batches of BATCH_SIZE."""
+        # One directory listing per frame directory instead of a stat per frame
+        directory_entries = {}
+        batch = []
+        for frame in frames:
+            directory, filename = os.path.split(frame.path)
+            if directory not in directory_entries:
+                try:
+                    with os.scandir(directory or '.') as entries:
+                        directory_entries[directory] = {entry.name for entry in entries}
+                except OSError:
+                    directory_entries[directory] = set()
+            if filename not in directory_entries[directory]:
+                print(f"Frame image not found: {frame.path}")
+                continue
+            batch.append(frame)
+            if len(batch) == self.BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
     
     def generate_frame_embeddings(self, video_id: int):
         """Generate CLIP embeddings for all frames of a video."""
         try:
             self._load_clip_model()
             
-            # Get all frames for the video
-            frames = self.db.query(Frame).filter(Frame.video_id == video_id).all()
-            if not frames:
+            # Stream frames for the video instead of loading every row up front
+            frames_query = self.db.query(Frame).filter(Frame.video_id == video_id)
+            total_frames = frames_query.count()
+            if not total_frames:
                 return {"error": "No frames found", "processed": 0}
             
             embeddings = []
             processed_count = 0
+            skipped_duplicates = 0
+            previous_dhash = None
             
             # Create embeddings directory
             embeddings_dir = Path(f"storage/embeddings/video_{video_id}")
             embeddings_dir.mkdir(parents=True, exist_ok=True)
+            embeddings_file = embeddings_dir / "frame_embeddings.pkl"
             
-            for frame in frames:
-                try:
-                    # Load frame image
-                    if not os.path.exists(frame.path):
-                        print(f"Frame image not found: {frame.path}")
-                        continue
+            # Reuse embeddings of unchanged frame images from the previous run
+            cached_embeddings = self._load_cached_embeddings(embeddings_file)
+            
+            batches = self._iter_frame_batches(
+                frames_query.order_by(Frame.timestamp)
+                .execution_options(stream_results=True)
+                .yield_per(self.BATCH_SIZE)
+            )
+            
+            with ThreadPoolExecutor(max_workers=self.DECODE_WORKERS) as executor:
+                def submit(batch):
+                    if batch is None:
+                        return None
+                    return [executor.submit(self._load_frame, frame, cached_embeddings) for frame in batch]
+                
+                pending = submit(next(batches, None))
+                while pending is not None:
+                    loaded = [future.result() for future in pending]
                     
-                    image = Image.open(frame.path).convert('RGB')
-                    image_tensor = self.preprocess(image).unsqueeze(0).to(self.device)
+                    # Decode the next batch while this one is being encoded
+                    pending = submit(next(batches, None))
                     
-                    # Generate embedding
-                    with torch.no_grad():
-                        embedding = self.model.encode_image(image_tensor)
-                        embedding = embedding / embedding.norm(dim=-1, keepdim=True)  # Normalize
+                    batch_frames = []
+                    image_tensors = []
                     
-                    embeddings.append({
-                        'frame_id': frame.id,
-                        'timestamp': frame.timestamp,
-                        'embedding': embedding.cpu().numpy()
-                    })
-                    processed_count += 1
+                    for item in loaded:
+                        if item is None:
+                            continue
+                        frame, content_hash, cached_record, image_tensor, frame_dhash = item
+                        
+                        # Skip frames that look the same as the last kept frame
+                        if frame_dhash is not None:
+                            if (
+                                self.DUPLICATE_HASH_DISTANCE
+                                and previous_dhash is not None
+                                and bin(frame_dhash ^ previous_dhash).count('1') < self.DUPLICATE_HASH_DISTANCE
+                            ):
+                                skipped_duplicates += 1
+                                continue
+                            previous_dhash = frame_dhash
+                        
+                        if cached_record is not None:
+                            embeddings.append({
+                                'frame_id': frame.id,
+                                'timestamp': frame.timestamp,
+                                **self._stored_embedding(_embedding_vector(cached_record)),
+                                'content_hash': content_hash,
+                                'dhash': frame_dhash
+                            })
+                            processed_count += 1
+                        else:
+                            image_tensors.append(image_tensor)
+                            batch_frames.append((frame, content_hash, frame_dhash))
+                    
+                    if not image_tensors:
+                        continue
+                    
+                    # Generate embeddings for the whole batch in one forward pass
+                    batch_embeddings = self._encode_images(torch.stack(image_tensors))
                     
-                except Exception as e:
-                    print(f"Error processing frame {frame.id}: {str(e)}")
-                    continue
+                    for (frame, content_hash, frame_dhash), embedding in zip(batch_frames, batch_embeddings):
+                        embeddings.append({
+                            'frame_id': frame.id,
+                            'timestamp': frame.timestamp,
+                            **self._stored_embedding(embedding),
+                            'content_hash': content_hash,
+                            'dhash': frame_dhash
+                        })
+                    processed_count += len(batch_frames)
             
             # Save embeddings to file
             if embeddings:
-                embeddings_file = embeddings_dir / "frame_embeddings.pkl"
                 with open(embeddings_file, 'wb') as f:
                     pickle.dump(embeddings, f)
                 
@@ -91,7 +377,8 @@ class SimpleEmbeddingService:
             return {
                 "success": True,
                 "processed": processed_count,
-                "total_frames": len(frames),
+                "skipped_duplicates": skipped_duplicates,
+                "total_frames": total_frames,
                 "embeddings_file": str(embeddings_file) if embeddings else None
             }
             
@@ -99,6 +386,10 @@ class SimpleEmbeddingService:
             print(f"Error generating embeddings: {str(e)}")
             return {"error": str(e), "processed": 0}
     
+    async def agenerate_frame_embeddings(self, video_id: int):
+        """Async variant of generate_frame_embeddings that runs off the event loop."""
+        return await asyncio.to_thread(self.generate_frame_embeddings, video_id)
+    
     def search_visual_content(self, video_id: int, query: str, limit: int = 10):
         """Search frames using text query against visual embeddings."""
         try:
@@ -116,30 +407,38 @@ class SimpleEmbeddingService:
                 return []
             
             # Generate query embedding
-            text_tokens = self.tokenizer([query]).to(self.device)
-            with torch.no_grad():
-                text_embedding = self.model.encode_text(text_tokens)
-                text_embedding = text_embedding / text_embedding.norm(dim=-1, keepdim=True)
-            
-            # Calculate similarities
-            similarities = []
-            for item in embeddings_data:
-                frame_embedding = torch.from_numpy(item['embedding']).to(self.device)
-                similarity = torch.cosine_similarity(text_embedding, frame_embedding).item()
-                similarities.append({
-                    'frame_id': item['frame_id'],
-                    'timestamp': item['timestamp'],
-                    'similarity': similarity
-                })
-            
-            # Sort by similarity and return top results
-            similarities.sort(key=lambda x: x['similarity'], reverse=True)
-            results = similarities[:limit]
-            
-            # Get frame details from database
+            text_embedding = self._encode_text(query).float().cpu().numpy().reshape(-1)
+            
+            # Stored frame embeddings and the query are unit-norm, so cosine
+            # similarity is a single float32 matrix-vector dot product
+            frame_matrix = np.vstack([_embedding_vector(item) for item in embeddings_data])
+            scores = frame_matrix @ text_embedding
+            
+            # Select the top results without sorting every score
+            limit = min(limit, len(scores))
+            if limit <= 0:
+                return []
+            top_indices = np.argpartition(-scores, limit - 1)[:limit]
+            top_indices = top_indices[np.argsort(-scores[top_indices])]
+            results = [
+                {
+                    'frame_id': embeddings_data[index]['frame_id'],
+                    'timestamp': embeddings_data[index]['timestamp'],
+                    'similarity': float(scores[index])
+                }
+                for index in top_indices
+            ]
+            
+            # Get frame details from database in a single round-trip
+            frame_ids = [result['frame_id'] for result in results]
+            frames_by_id = {
+                frame.id: frame
+                for frame in self.db.query(Frame).filter(Frame.id.in_(frame_ids)).all()
+            }
+            
             detailed_results = []
             for result in results:
-                frame = self.db.query(Frame).filter(Frame.id == result['frame_id']).first()
+                frame = frames_by_id.get(result['frame_id'])
                 if frame:
                     detailed_results.append({
                         'frame_id': frame.id,
@@ -154,6 +453,10 @@ class SimpleEmbeddingService:
             print(f"Error in visual search: {str(e)}")
             return []
     
+    async def asearch_visual_content(self, video_id: int, query: str, limit: int = 10):
+        """Async variant of search_visual_content that runs off the event loop."""
+        return await asyncio.to_thread(self.search_visual_content, video_id, query, limit)
+    
     def get_embeddings_status(self, video_id: int):
         """Check if embeddings exist for a video."""
         embeddings_file = Path(f"storage/embeddings/video_{video_id}/frame_embeddings.pkl")
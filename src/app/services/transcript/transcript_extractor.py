@@ -9,6 +9,11 @@ import subprocess
 from typing import List, Dict, Any
 import google.generativeai as genai
 
+from .transcript_parser import TranscriptParser
+
+# The parser holds no state, so one instance serves every extraction
+_PARSER = TranscriptParser()
+
 
 class TranscriptExtractor:
     """Handles transcript extraction from multiple sources."""
@@ -133,9 +138,7 @@ class TranscriptExtractor:
                 pass
             
             # Parse Gemini response into transcript format
-            from .transcript_parser import TranscriptParser
-            parser = TranscriptParser()
-            return parser.parse_gemini_response(response.text)
+            return _PARSER.parse_gemini_response(response.text)
             
         except Exception as e:
             print(f"❌ Gemini video analysis error: {e}")
@@ -169,9 +172,7 @@ class TranscriptExtractor:
                 
                 if subtitle_files:
                     # Parse VTT file
-                    from .transcript_parser import TranscriptParser
-                    parser = TranscriptParser()
-                    transcript = parser.parse_vtt_file(subtitle_files[0])
+                    transcript = _PARSER.parse_vtt_file(subtitle_files[0])
                     
                     # Clean up
                     for file in os.listdir(temp_dir):